@@ -377,8 +377,14 @@ def get_obproxy_version(is_ssh, ssh_helper, obproxy_install_dir, stdio):
 
 # Only applicable to the community version
 
+# observer version queried by sql, keyed by (db_host, db_port). The version does not change during one obdiag run
+_observer_version_by_sql_cache = {}
+
 
 def get_observer_version_by_sql(ob_cluster, stdio=None):
+    cache_key = (ob_cluster.get("db_host"), ob_cluster.get("db_port"))
+    if cache_key in _observer_version_by_sql_cache:
+        return _observer_version_by_sql_cache[cache_key]
     stdio.verbose("start get_observer_version_by_sql . input: {0}".format(ob_cluster))
     try:
         ob_connector = OBConnector(ip=ob_cluster.get("db_host"), port=ob_cluster.get("db_port"), username=ob_cluster.get("tenant_sys").get("user"), password=ob_cluster.get("tenant_sys").get("password"), stdio=stdio, timeout=100)
@@ -390,10 +396,11 @@ def get_observer_version_by_sql(ob_cluster, stdio=None):
     stdio.verbose("get_observer_version_by_sql ob_version_info is {0}".format(ob_version))
     version = re.findall(r'OceanBase(_)?(.CE)?-v(.+)', ob_version[0])
     if len(version) > 0:
-        return version[0][2]
+        version = version[0][2]
     else:
-        version = re.findall(r'(.+)', ob_version[0])
-        return version[0]
+        version = re.findall(r'(.+)', ob_version[0])[0]
+    _observer_version_by_sql_cache[cache_key] = version
+    return version
 
 
 def get_observer_pid(is_ssh, ssh_helper, ob_install_dir, stdio=None):
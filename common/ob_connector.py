@@ -15,9 +15,13 @@
 @file: ob_connector.py
 @desc:
 """
+import time
 from prettytable import from_db_cursor
 import pymysql as mysql
 
+# a connection used within this many seconds is trusted to be alive, older ones are pinged before the next query
+CONN_PING_IDLE_SECONDS = 30
+
 
 class OBConnector(object):
     def __init__(
@@ -38,6 +42,7 @@ class OBConnector(object):
         self.conn = None
         self.stdio = stdio
         self.database = database
+        self.last_active_time = 0
         self.init()
 
     def init(self):
@@ -56,6 +61,7 @@ class OBConnector(object):
                 db=self.database,
                 connect_timeout=30,
             )
+            self.last_active_time = time.monotonic()
             self.stdio.verbose("connect databse ...")
         except mysql.Error as e:
             self.stdio.error("connect OB: {0}:{1} with user {2} failed, error:{3}".format(self.ip, self.port, self.username, e))
@@ -71,63 +77,64 @@ class OBConnector(object):
         except Exception as e:
             self.stdio.warn("set ob_query_timeout failed, error:{0}".format(e))
 
-    def execute_sql(self, sql):
+    def _check_conn(self):
         if self.conn is None:
             self._connect_db()
-        else:
+        elif not self.conn.open or time.monotonic() - self.last_active_time > CONN_PING_IDLE_SECONDS:
+            # a connection lost mid-run is closed by pymysql and must be reopened right away,
+            # an open one is only pinged after it sat idle long enough for the server to drop it
             self.conn.ping(reconnect=True)
+        self.last_active_time = time.monotonic()
+
+    def execute_sql(self, sql, args=None):
+        self._check_conn()
         cursor = self.conn.cursor()
-        cursor.execute(sql)
+        cursor.execute(sql, args)
         ret = cursor.fetchall()
         cursor.close()
         return ret
 
-    def execute_sql_return_columns_and_data(self, sql):
-        if self.conn is None:
-            self._connect_db()
-        else:
-            self.conn.ping(reconnect=True)
+    def execute_sql_return_columns_and_data(self, sql, args=None):
+        self._check_conn()
         cursor = self.conn.cursor()
-        cursor.execute(sql)
+        cursor.execute(sql, args)
         column_names = [col[0] for col in cursor.description]
         ret = cursor.fetchall()
         cursor.close()
         return column_names, ret
 
-    def execute_sql_return_cursor_dictionary(self, sql):
-        if self.conn is None:
-            self._connect_db()
-        else:
-            self.conn.ping(reconnect=True)
+    def execute_sql_return_cursor_dictionary(self, sql, args=None):
+        self._check_conn()
         cursor = self.conn.cursor(mysql.cursors.DictCursor)
-        cursor.execute(sql)
+        try:
+            cursor.execute(sql, args)
+        except Exception:
+            # the caller never gets the cursor of a failed statement, close it here
+            cursor.close()
+            raise
         return cursor
 
-    def execute_sql_return_cursor(self, sql):
-        if self.conn is None:
-            self._connect_db()
-        else:
-            self.conn.ping(reconnect=True)
+    def execute_sql_return_cursor(self, sql, args=None):
+        self._check_conn()
         cursor = self.conn.cursor()
-        cursor.execute(sql)
+        try:
+            cursor.execute(sql, args)
+        except Exception:
+            # the caller never gets the cursor of a failed statement, close it here
+            cursor.close()
+            raise
         return cursor
 
-    def execute_sql_pretty(self, sql):
-        if self.conn is None:
-            self._connect_db()
-        else:
-            self.conn.ping(reconnect=True)
+    def execute_sql_pretty(self, sql, args=None):
+        self._check_conn()
         cursor = self.conn.cursor()
-        cursor.execute(sql)
+        cursor.execute(sql, args)
         ret = from_db_cursor(cursor)
         cursor.close()
         return ret
 
     def callproc(self, procname, args=()):
-        if self.conn is None:
-            self._connect_db()
-        else:
-            self.conn.ping(reconnect=True)
+        self._check_conn()
         cursor = self.conn.cursor()
         cursor.callproc(procname, args)
         ret = cursor.fetchall()
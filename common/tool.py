@@ -30,6 +30,7 @@ import shutil
 import re
 import json
 import hashlib
+import functools
 import datetime
 import tabulate
 import tarfile
@@ -63,6 +64,13 @@ __all__ = ("Timeout", "DynamicLoading", "ConfigUtil", "DirectoryUtil", "FileUtil
 
 _WINDOWS = os.name == 'nt'
 
+# read size when hashing files, large enough that the read loop is not the bottleneck
+FILE_HASH_CHUNK_SIZE = 1024 * 1024
+# chunk size of streamed http downloads, small chunks make the python loop the limit on fast links
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# buffer tarfile copies member data with, its default is 16 KiB
+TAR_COPY_BUFSIZE = 2 * 1024 * 1024
+
 
 class Timeout(object):
 
@@ -436,7 +444,7 @@ class FileUtil(object):
         if not os.path.exists(output_path):
             os.makedirs(output_path)
         try:
-            with tarfile.open(tar_path, 'r') as tar:
+            with tarfile.open(tar_path, 'r', copybufsize=TAR_COPY_BUFSIZE) as tar:
                 tar.extractall(path=output_path)
         except:
             stdio and getattr(stdio, 'exception', print)('failed to extract tar file %s' % tar_path)
@@ -534,8 +542,11 @@ class FileUtil(object):
         try:
             filepath = os.path.expanduser(filepath)
             with open(filepath, 'rb') as file:
+                if hasattr(hashlib, 'file_digest'):
+                    # python 3.11+, hashes straight from the file without a python level read loop
+                    return hashlib.file_digest(file, 'sha256').hexdigest()
                 while True:
-                    data = file.read(8192)
+                    data = file.read(FILE_HASH_CHUNK_SIZE)
                     if not data:
                         break
                     sha256.update(data)
@@ -750,10 +761,17 @@ class NetUtils(object):
             return localhost_ip
 
     @staticmethod
-    def network_connectivity(url="", stdio=None):
+    def session():
+        """
+        a requests.Session to pass to the calls below, requests to the same host then reuse one keep-alive connection
+        """
+        return requests.Session()
+
+    @staticmethod
+    def network_connectivity(url="", stdio=None, session=None):
         try:
             socket.setdefaulttimeout(3)
-            response = requests.get(url, timeout=(3))
+            response = (session or requests).get(url, timeout=(3))
             if response.status_code is not None:
                 return True
             else:
@@ -762,14 +780,29 @@ class NetUtils(object):
             return False
 
     @staticmethod
-    def download_file(url, local_filename, stdio=None):
-        with requests.get(url, stream=True) as r:
+    def download_file(url, local_filename, stdio=None, session=None, hasher=None):
+        """
+        :param hasher: optional hashlib object, updated with every chunk as it is written
+        """
+        with (session or requests).get(url, stream=True) as r:
             r.raise_for_status()
             with open(local_filename, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                     f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
         return local_filename
 
+    @staticmethod
+    def download_file_with_sha256(url, local_filename, stdio=None, session=None):
+        """
+        download_file that hashes the content as it is written, so the file need not be read back
+        :return: sha256 hex digest of the downloaded file
+        """
+        sha256 = hashlib.sha256()
+        NetUtils.download_file(url, local_filename, stdio=stdio, session=session, hasher=sha256)
+        return sha256.hexdigest()
+
 
 COMMAND_ENV = CommandEnv()
 
@@ -1002,6 +1035,17 @@ class TimeUtils(object):
         return int(datetime.datetime.timestamp(temp) * 10**6)
 
 
+# leading digits of one dot separated version component
+_VERSION_PART_RE = re.compile(r'\d*')
+
+
+@functools.lru_cache(maxsize=256)
+def _version_tuple(version):
+    # "4.2.1.0" -> (4, 2, 1, 0), "4.3.0.1-beta" -> (4, 3, 0, 1). the same few version literals are compared over and over, parse each of them once.
+    # A suffix after the digits is dropped and a component without digits counts as 0, every component is kept for the length tie-break
+    return tuple(int(_VERSION_PART_RE.match(part).group() or 0) for part in version.split("."))
+
+
 class StringUtils(object):
 
     @staticmethod
@@ -1194,19 +1238,12 @@ class StringUtils(object):
 
     @staticmethod
     def compare_versions_greater(v1, v2, stdio=None):
-        for i, j in zip(map(int, v1.split(".")), map(int, v2.split("."))):
-            if i == j:
-                continue
-            return i > j
-        return len(v1.split(".")) > len(v2.split("."))
+        # tuples compare item by item and a shorter tuple that is a prefix of the other is the lower one
+        return _version_tuple(v1) > _version_tuple(v2)
 
     @staticmethod
     def compare_versions_lower(v1, v2, stdio=None):
-        for i, j in zip(map(int, v1.split(".")), map(int, v2.split("."))):
-            if i == j:
-                continue
-            return i < j
-        return len(v1.split(".")) < len(v2.split("."))
+        return _version_tuple(v1) < _version_tuple(v2)
 
 
 class Cursor(SafeStdio):
@@ -63,10 +63,11 @@ class AnalyzeFltTraceHandler(object):
         recursion_option = Util.get_option(options, 'recursion')
         output_option = Util.get_option(options, 'output')
         if store_dir_option is not None:
-            if not os.path.exists(os.path.abspath(store_dir_option)):
-                self.stdio.warn('Warning: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(os.path.abspath(store_dir_option)))
-                os.makedirs(os.path.abspath(store_dir_option))
-            self.gather_pack_dir = os.path.abspath(store_dir_option)
+            store_dir_abs = os.path.abspath(store_dir_option)
+            if not os.path.exists(store_dir_abs):
+                self.stdio.warn('Warning: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(store_dir_abs))
+                os.makedirs(store_dir_abs, exist_ok=True)
+            self.gather_pack_dir = store_dir_abs
         if files_option:
             self.directly_analyze_files = True
             self.analyze_files_list = files_option
@@ -110,10 +110,11 @@ class AnalyzeLogHandler(BaseShellHandler):
             if not self.directly_analyze_files:
                 self.stdio.print('analyze log from_time: {0}, to_time: {1}'.format(self.from_time_str, self.to_time_str))
         if store_dir_option is not None:
-            if not os.path.exists(os.path.abspath(store_dir_option)):
-                self.stdio.warn('Error: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(os.path.abspath(store_dir_option)))
-                os.makedirs(os.path.abspath(store_dir_option))
-            self.gather_pack_dir = os.path.abspath(store_dir_option)
+            store_dir_abs = os.path.abspath(store_dir_option)
+            if not os.path.exists(store_dir_abs):
+                self.stdio.warn('Error: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(store_dir_abs))
+                os.makedirs(store_dir_abs, exist_ok=True)
+            self.gather_pack_dir = store_dir_abs
         if grep_option is not None:
             self.grep_args = grep_option
         if scope_option:
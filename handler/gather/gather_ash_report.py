@@ -43,10 +43,7 @@ class GatherAshReportHandler(SafeStdio):
         self.stdio = self.context.stdio
         self.gather_pack_dir = gather_pack_dir
         self.ob_cluster = self.context.cluster_config
-        if self.context.get_variable("gather_timestamp", None):
-            self.gather_timestamp = self.context.get_variable("gather_timestamp")
-        else:
-            self.gather_timestamp = TimeUtils.get_current_us_timestamp()
+        self.gather_timestamp = self.context.get_variable("gather_timestamp") or TimeUtils.get_current_us_timestamp()
         self.cluster = self.context.cluster_config
 
         self.observer_nodes = self.context.cluster_config.get("servers")
@@ -157,10 +154,11 @@ class GatherAshReportHandler(SafeStdio):
             self.from_time_str = (now_time - datetime.timedelta(minutes=30)).strftime('%Y-%m-%d %H:%M:%S')
             self.stdio.print('gather from_time: {0}, to_time: {1}'.format(self.from_time_str, self.to_time_str))
         if store_dir_option:
-            if not os.path.exists(os.path.abspath(store_dir_option)):
-                self.stdio.warn('warn: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(os.path.abspath(store_dir_option)))
-                os.makedirs(os.path.abspath(store_dir_option))
-            self.gather_pack_dir = os.path.abspath(store_dir_option)
+            store_dir_abs = os.path.abspath(store_dir_option)
+            if not os.path.exists(store_dir_abs):
+                self.stdio.warn('warn: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(store_dir_abs))
+                os.makedirs(store_dir_abs, exist_ok=True)
+            self.gather_pack_dir = store_dir_abs
         if sql_id_option:
             self.sql_id = sql_id_option
         else:
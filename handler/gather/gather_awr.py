@@ -36,10 +36,7 @@ class GatherAwrHandler(object):
         self.gather_pack_dir = gather_pack_dir
         self.cluster_name = None
         self.cluster_id = None
-        if self.context.get_variable("gather_timestamp", None):
-            self.gather_timestamp = self.context.get_variable("gather_timestamp")
-        else:
-            self.gather_timestamp = TimeUtils.get_current_us_timestamp()
+        self.gather_timestamp = self.context.get_variable("gather_timestamp") or TimeUtils.get_current_us_timestamp()
 
     def init_config(self):
         ocp = self.context.ocp_config
@@ -269,10 +266,11 @@ class GatherAwrHandler(object):
             self.from_time_str = (now_time - datetime.timedelta(seconds=3 * 3600)).strftime('%Y-%m-%d %H:%M:%S')
             self.stdio.print('gather log from_time: {0}, to_time: {1}'.format(self.from_time_str, self.to_time_str))
         if store_dir_option and store_dir_option != "./":
-            if not os.path.exists(os.path.abspath(store_dir_option)):
-                self.stdio.warn('warn: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(os.path.abspath(store_dir_option)))
-                os.makedirs(os.path.abspath(store_dir_option))
-            self.gather_pack_dir = os.path.abspath(store_dir_option)
+            store_dir_abs = os.path.abspath(store_dir_option)
+            if not os.path.exists(store_dir_abs):
+                self.stdio.warn('warn: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(store_dir_abs))
+                os.makedirs(store_dir_abs, exist_ok=True)
+            self.gather_pack_dir = store_dir_abs
         return True
 
     @staticmethod
@@ -48,10 +48,7 @@ class GatherObAdminHandler(BaseShellHandler):
         self.grep_args = None
         self.zip_encrypt = False
         self.config_path = const.DEFAULT_CONFIG_PATH
-        if self.context.get_variable("gather_timestamp", None):
-            self.gather_timestamp = self.context.get_variable("gather_timestamp")
-        else:
-            self.gather_timestamp = TimeUtils.get_current_us_timestamp()
+        self.gather_timestamp = self.context.get_variable("gather_timestamp") or TimeUtils.get_current_us_timestamp()
 
     def init_config(self):
         self.nodes = self.context.cluster_config['servers']
@@ -106,10 +103,11 @@ class GatherObAdminHandler(BaseShellHandler):
                 self.from_time_str = (now_time - datetime.timedelta(minutes=30)).strftime('%Y-%m-%d %H:%M:%S')
             self.stdio.print('gather from_time: {0}, to_time: {1}'.format(self.from_time_str, self.to_time_str))
         if store_dir_option and store_dir_option != './':
-            if not os.path.exists(os.path.abspath(store_dir_option)):
-                self.stdio.warn('Error: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(os.path.abspath(store_dir_option)))
-                os.makedirs(os.path.abspath(store_dir_option))
-            self.local_stored_path = os.path.abspath(store_dir_option)
+            store_dir_abs = os.path.abspath(store_dir_option)
+            if not os.path.exists(store_dir_abs):
+                self.stdio.warn('Error: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(store_dir_abs))
+                os.makedirs(store_dir_abs, exist_ok=True)
+            self.local_stored_path = store_dir_abs
         if encrypt_option == "true":
             self.zip_encrypt = True
         return True
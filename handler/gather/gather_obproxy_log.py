@@ -51,10 +51,7 @@ class GatherObProxyLogHandler(BaseShellHandler):
         self.zip_encrypt = False
         self.is_scene = is_scene
         self.config_path = const.DEFAULT_CONFIG_PATH
-        if self.context.get_variable("gather_timestamp", None):
-            self.gather_timestamp = self.context.get_variable("gather_timestamp")
-        else:
-            self.gather_timestamp = TimeUtils.get_current_us_timestamp()
+        self.gather_timestamp = self.context.get_variable("gather_timestamp") or TimeUtils.get_current_us_timestamp()
 
     def init_config(self):
         self.nodes = self.context.obproxy_config['servers']
@@ -81,18 +78,12 @@ class GatherObProxyLogHandler(BaseShellHandler):
         grep_option = Util.get_option(options, 'grep')
         encrypt_option = Util.get_option(options, 'encrypt')
         scope_option = Util.get_option(options, 'scope')
-        if self.context.get_variable("gather_from", None):
-            from_option = self.context.get_variable("gather_from")
-        if self.context.get_variable("gather_to", None):
-            to_option = self.context.get_variable("gather_to")
-        if self.context.get_variable("gather_since", None):
-            since_option = self.context.get_variable("gather_since")
-        if self.context.get_variable("store_dir", None):
-            store_dir_option = self.context.get_variable("store_dir")
-        if self.context.get_variable("gather_scope", None):
-            scope_option = self.context.get_variable("gather_scope")
-        if self.context.get_variable("gather_grep", None):
-            grep_option = self.context.get_variable("gather_grep")
+        from_option = self.context.get_variable("gather_from") or from_option
+        to_option = self.context.get_variable("gather_to") or to_option
+        since_option = self.context.get_variable("gather_since") or since_option
+        store_dir_option = self.context.get_variable("store_dir") or store_dir_option
+        scope_option = self.context.get_variable("gather_scope") or scope_option
+        grep_option = self.context.get_variable("gather_grep") or grep_option
 
         if from_option is not None and to_option is not None:
             try:
@@ -121,10 +112,11 @@ class GatherObProxyLogHandler(BaseShellHandler):
                 self.from_time_str = (now_time - datetime.timedelta(minutes=30)).strftime('%Y-%m-%d %H:%M:%S')
             self.stdio.print('gather from_time: {0}, to_time: {1}'.format(self.from_time_str, self.to_time_str))
         if store_dir_option and store_dir_option != './':
-            if not os.path.exists(os.path.abspath(store_dir_option)):
-                self.stdio.warn('warn: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(os.path.abspath(store_dir_option)))
-                os.makedirs(os.path.abspath(store_dir_option))
-            self.gather_pack_dir = os.path.abspath(store_dir_option)
+            store_dir_abs = os.path.abspath(store_dir_option)
+            if not os.path.exists(store_dir_abs):
+                self.stdio.warn('warn: args --store_dir [{0}] incorrect: No such directory, Now create it'.format(store_dir_abs))
+                os.makedirs(store_dir_abs, exist_ok=True)
+            self.gather_pack_dir = store_dir_abs
         if scope_option:
             self.scope = scope_option
         if encrypt_option == "true":
@@ -16,14 +16,16 @@
 @desc:
 """
 import os
+import queue
 import re
 import sys
 import shutil
 import time
-from decimal import Decimal
 import pymysql as mysql
 import tabulate
+from concurrent.futures import ThreadPoolExecutor
 from prettytable import from_db_cursor
+from prettytable import PrettyTable
 from common.ob_connector import OBConnector
 from handler.meta.html_meta import GlobalHtmlMeta
 from handler.meta.sql_meta import GlobalSqlMeta
@@ -34,6 +36,87 @@ from common.tool import FileUtil
 from common.tool import TimeUtils
 
 
+def _otherstat_mb_value(value):
+    return "%0.3fMB" % (float(value) / 1024.0 / 1024)
+
+
+def _otherstat_time_value(value):
+    seconds, microseconds = divmod(value, 1000000)
+    return "%s.%06d" % (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds)), microseconds)
+
+
+# v$sql_monitor_statname TYPE -> value formatter
+_DETAIL_OTHERSTAT_FORMATTERS = {0: str, 1: str, 2: _otherstat_mb_value, 3: _otherstat_time_value}
+# the aggregated views skip the stats whose type has no formatter here
+_AGG_OTHERSTAT_FORMATTERS = {0: str, 1: str, 2: _otherstat_mb_value}
+# (stat id column, stat value column) pairs of a sql plan monitor row
+_DETAIL_OTHERSTAT_COLUMNS = [("OTHERSTAT_%d_ID" % i, "OTHERSTAT_%d_VALUE" % i) for i in range(1, 7)]
+_AGG_OTHERSTAT_COLUMNS = [("OTHERSTAT_%d_ID" % i, "SUM_STAT_%d" % i) for i in range(1, 7)]
+
+# css/js bundled with obdiag that the report pages load, next to the binary when frozen or at the source root
+if getattr(sys, 'frozen', False):
+    CS_RESOURCES_PATH = os.path.join(os.path.dirname(sys.executable), "resources")
+else:
+    CS_RESOURCES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "resources")
+
+# tables longer than this keep only their head and tail inline, the full table goes to its own page
+REPORT_INLINE_TABLE_MAX_ROWS = 500
+
+# upper bound of the sys tenant connections opened to prefetch the sql plan monitor queries
+SYS_SQL_PREFETCH_MAX_WORKERS = 4
+
+
+def _link_or_copy(src, dst):
+    # hard link the report resources instead of copying them, fall back to a copy across filesystems or under protected_hardlinks
+    if os.path.exists(dst):
+        if os.path.samefile(src, dst):
+            return dst
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+# one sql used by the report, shown at the end of it
+_SQL_HELP_HTML = "<div class='help' style='font-size:11px'>{label}<hr /><pre>{sql}</pre></div><br/>"
+# preformatted block for ddl, variables and plans
+_PRE_HTML = "<pre style='margin:20px;border:1px solid gray;'>{0}</pre>"
+
+# reserved words of the traced sql, they can not be a table name so report_schema does not send `show create table` for them.
+# A table named like one has to be quoted with backticks in the sql, and the quoted word is not skipped
+_SQL_KEYWORDS = frozenset(
+    "select from where and or not in is null like between exists as on using join inner left right outer cross natural straight_join union all distinct group by order having limit asc desc case when then else with insert into values update set delete replace for lock interval true false div mod xor partition".split()
+)
+
+# observer version in `show variables like 'version_comment'` (mysql tenant) and in the V$VERSION banner (oracle tenant)
+_MYSQL_VERSION_COMMENT_RE = re.compile(r'(?:OceanBase(_CE)?\s+)?(\d+\.\d+\.\d+\.\d+)')
+_ORACLE_BANNER_VERSION_RE = re.compile(r'(\d+\.\d+\.\d+\.\d+)')
+
+# (ip, port, user) of the db connector -> (sql_audit_name, plan_explain_name, ob_major_version, tenant_mode, sys_database).
+# The tenant mode and version do not change during one obdiag run
+_tenant_mode_cache = {}
+
+# the templates live in the class level dict of GlobalSqlMeta, one instance is enough
+_sql_meta = GlobalSqlMeta()
+
+# ##REPLACE_XXX## placeholders of the GlobalSqlMeta templates
+_TEMPLATE_PLACEHOLDER_RE = re.compile(r'##REPLACE_([A-Z_]+)##')
+
+
+def _fill_template(template, values):
+    """
+    substitute all ##REPLACE_XXX## placeholders in one pass, placeholders missing from values are left as they are
+    :param values: placeholder name without the REPLACE_ prefix -> replacement
+    """
+    return _TEMPLATE_PLACEHOLDER_RE.sub(lambda m: values.get(m.group(1), m.group(0)), template)
+
+
+def _fill_monitor_template(template, trace_id, order_by):
+    return _fill_template(template, {"TRACE_ID": trace_id, "ORDER_BY": order_by})
+
+
 class GatherPlanMonitorHandler(object):
     def __init__(self, context, gather_pack_dir='./', is_scene=False):
         self.context = context
@@ -46,17 +129,24 @@ class GatherPlanMonitorHandler(object):
         self.enable_dump_db = True
         self.trace_id = None
         self.env = {}
+        # v$sql_monitor_statname ID -> (TYPE, NAME)
         self.STAT_NAME = {}
         self.report_file_path = ""
+        # report html pieces, written to report_file_path in one go by __flush_report
+        self.report_buf = []
+        # sql -> future of (columns, rows), see __prefetch_sys_sql
+        self.sys_sql_futures = {}
+        # pool behind sys_sql_futures and the idle connections of its workers, released by __close_prefetch
+        self.sys_sql_executor = None
+        self.sys_sql_connectors = queue.Queue()
         self.enable_fast_dump = False
         self.ob_major_version = None
         self.sql_audit_name = "gv$sql_audit"
         self.plan_explain_name = "gv$plan_cache_plan_explain"
+        # (tenant_mode, sql_audit_name) -> sql of sql_audit_by_trace_id_limit1_sql
+        self.sql_audit_limit1_sql_cache = {}
         self.is_scene = is_scene
-        if self.context.get_variable("gather_timestamp", None):
-            self.gather_timestamp = self.context.get_variable("gather_timestamp")
-        else:
-            self.gather_timestamp = TimeUtils.get_current_us_timestamp()
+        self.gather_timestamp = self.context.get_variable("gather_timestamp") or TimeUtils.get_current_us_timestamp()
 
     def init_config(self):
         ob_cluster = self.context.cluster_config
@@ -70,23 +160,41 @@ class GatherPlanMonitorHandler(object):
         trace_id_option = Util.get_option(options, 'trace_id')
         store_dir_option = Util.get_option(options, 'store_dir')
         env_option = Util.get_option(options, 'env')
-        if self.context.get_variable("gather_plan_monitor_trace_id", None):
-            trace_id_option = self.context.get_variable("gather_plan_monitor_trace_id")
+        trace_id_option = self.context.get_variable("gather_plan_monitor_trace_id") or trace_id_option
         if trace_id_option is not None:
             self.trace_id = trace_id_option
         else:
             self.stdio.error("option --trace_id not found, please provide")
             return False
         if store_dir_option and store_dir_option != './':
-            if not os.path.exists(os.path.abspath(store_dir_option)):
-                self.stdio.warn('warn: option --store_dir [{0}] incorrect: No such directory, Now create it'.format(os.path.abspath(store_dir_option)))
-                os.makedirs(os.path.abspath(store_dir_option))
-            self.local_stored_path = os.path.abspath(store_dir_option)
+            store_dir_abs = os.path.abspath(store_dir_option)
+            if not os.path.exists(store_dir_abs):
+                self.stdio.warn('warn: option --store_dir [{0}] incorrect: No such directory, Now create it'.format(store_dir_abs))
+                os.makedirs(store_dir_abs, exist_ok=True)
+            self.local_stored_path = store_dir_abs
         if env_option is not None:
             self.__init_db_conn(env_option)
         else:
             self.db_connector = self.sys_connector
-        return self.tenant_mode_detected()
+        if not self.tenant_mode_detected():
+            return False
+        self.__bind_version_dispatch()
+        return True
+
+    def __bind_version_dispatch(self):
+        """
+        pick the graph data renderers for the detected ob major version once, so the report methods need not branch on it
+        """
+        if self.ob_major_version >= 4:
+            self.__report_dfo_sched_graph = self.report_dfo_sched_agg_graph_data_obversion4
+            self.__report_dfo_agg_graph = self.report_dfo_agg_graph_data_obversion4
+            self.__report_svr_agg_graph = self.report_svr_agg_graph_data_obversion4
+            self.__report_detail_graph = self.report_detail_graph_data_obversion4
+        else:
+            self.__report_dfo_sched_graph = self.report_dfo_sched_agg_graph_data
+            self.__report_dfo_agg_graph = self.report_dfo_agg_graph_data
+            self.__report_svr_agg_graph = self.report_svr_agg_graph_data
+            self.__report_detail_graph = self.report_detail_graph_data
 
     def __init_db_connector(self):
         self.db_connector = OBConnector(ip=self.db_conn.get("host"), port=self.db_conn.get("port"), username=self.db_conn.get("user"), password=self.db_conn.get("password"), database=self.db_conn.get("database"), stdio=self.stdio, timeout=100)
@@ -113,7 +221,7 @@ class GatherPlanMonitorHandler(object):
             handler sql plan monitor from ob
             :return:
             """
-            st = time.time()
+            st = time.perf_counter_ns()
             resp = self.init_resp()
             result_sql_audit_by_trace_id_limit1 = self.select_sql_audit_by_trace_id_limit1()
             if len(result_sql_audit_by_trace_id_limit1) > 0:
@@ -126,26 +234,29 @@ class GatherPlanMonitorHandler(object):
                 tenant_id = trace[10]
                 svr_ip = trace[12]
                 svr_port = trace[13]
-                self.stdio.verbose("TraceID : %s " % trace_id)
-                self.stdio.verbose("SQL : %s " % sql)
-                self.stdio.verbose("SVR_IP : %s " % svr_ip)
-                self.stdio.verbose("SVR_PORT : %s " % svr_port)
-                self.stdio.verbose("DB: %s " % db_name)
-                self.stdio.verbose("PLAN_ID: %s " % plan_id)
-                self.stdio.verbose("TENANT_ID: %s " % tenant_id)
+                self.stdio.verbose("TraceID : %s ", trace_id)
+                self.stdio.verbose("SQL : %s ", sql)
+                self.stdio.verbose("SVR_IP : %s ", svr_ip)
+                self.stdio.verbose("SVR_PORT : %s ", svr_port)
+                self.stdio.verbose("DB: %s ", db_name)
+                self.stdio.verbose("PLAN_ID: %s ", plan_id)
+                self.stdio.verbose("TENANT_ID: %s ", tenant_id)
 
                 sql_plan_monitor_svr_agg_template = self.sql_plan_monitor_svr_agg_template_sql()
-                sql_plan_monitor_svr_agg_v1 = str(sql_plan_monitor_svr_agg_template).replace("##REPLACE_TRACE_ID##", trace_id).replace("##REPLACE_ORDER_BY##", "PLAN_LINE_ID ASC, MAX_CHANGE_TIME ASC, SVR_IP, SVR_PORT")
-                sql_plan_monitor_svr_agg_v2 = str(sql_plan_monitor_svr_agg_template).replace("##REPLACE_TRACE_ID##", trace_id).replace("##REPLACE_ORDER_BY##", "SVR_IP, SVR_PORT, PLAN_LINE_ID")
+                sql_plan_monitor_svr_agg_v1 = _fill_monitor_template(sql_plan_monitor_svr_agg_template, trace_id, "PLAN_LINE_ID ASC, MAX_CHANGE_TIME ASC, SVR_IP, SVR_PORT")
+                sql_plan_monitor_svr_agg_v2 = _fill_monitor_template(sql_plan_monitor_svr_agg_template, trace_id, "SVR_IP, SVR_PORT, PLAN_LINE_ID")
 
                 sql_plan_monitor_detail_template = self.sql_plan_monitor_detail_template_sql()
-                sql_plan_monitor_detail_v1 = str(sql_plan_monitor_detail_template).replace("##REPLACE_TRACE_ID##", trace_id).replace("##REPLACE_ORDER_BY##", "PLAN_LINE_ID ASC, SVR_IP, SVR_PORT, CHANGE_TS, PROCESS_NAME ASC")
-                sql_plan_monitor_detail_v2 = str(sql_plan_monitor_detail_template).replace("##REPLACE_TRACE_ID##", trace_id).replace("##REPLACE_ORDER_BY##", "PROCESS_NAME ASC, PLAN_LINE_ID ASC, FIRST_REFRESH_TIME ASC")
+                sql_plan_monitor_detail_v1 = _fill_monitor_template(sql_plan_monitor_detail_template, trace_id, "PLAN_LINE_ID ASC, SVR_IP, SVR_PORT, CHANGE_TS, PROCESS_NAME ASC")
+                sql_plan_monitor_detail_v2 = _fill_monitor_template(sql_plan_monitor_detail_template, trace_id, "PROCESS_NAME ASC, PLAN_LINE_ID ASC, FIRST_REFRESH_TIME ASC")
 
                 sql_plan_monitor_dfo_op = self.sql_plan_monitor_dfo_op_sql(tenant_id, plan_id, trace_id)
                 full_audit_sql_by_trace_id_sql = self.full_audit_sql_by_trace_id_sql(trace_id)
                 plan_explain_sql = self.plan_explain_sql(tenant_id, plan_id, svr_ip, svr_port)
 
+                # sql plan monitor 的查询互不依赖，提前并发执行，下面按顺序输出
+                self.__prefetch_sys_sql([sql_plan_monitor_dfo_op, sql_plan_monitor_svr_agg_v1, sql_plan_monitor_svr_agg_v2, sql_plan_monitor_detail_v1, sql_plan_monitor_detail_v2])
+
                 # 输出报告头
                 self.stdio.verbose("[sql plan monitor report task] report header")
                 self.report_header()
@@ -153,7 +264,7 @@ class GatherPlanMonitorHandler(object):
                 self.stdio.verbose("[sql plan monitor report task] report sql_audit")
                 self.report_sql_audit()
                 # 输出sql explain的信息
-                self.stdio.verbose("[sql plan monitor report task] report plan explain, sql: [{0}]".format(sql))
+                self.stdio.verbose("[sql plan monitor report task] report plan explain, sql: [%s]", sql)
                 self.report_plan_explain(db_name, sql)
                 # 输出plan cache的信息
                 self.stdio.verbose("[sql plan monitor report task] report plan cache")
@@ -180,13 +291,14 @@ class GatherPlanMonitorHandler(object):
                 self.reportsql_plan_monitor_detail_svr_priority(sql_plan_monitor_detail_v2)
 
                 # 输出本报告在租户下使用的 SQL
-                self.__report("<h4>本报告在租户下使用的 SQL</h4>")
-                self.__report("<div class='help' style='font-size:11px'>DFO 级<hr /><pre>%s</pre></div><br/>" % (sql_plan_monitor_dfo_op))
-                self.__report("<div class='help' style='font-size:11px'>机器级<hr /><pre>%s</pre></div><br/>" % (sql_plan_monitor_svr_agg_v1))
-                self.__report("<div class='help' style='font-size:11px'>线程级<hr /><pre>%s</pre></div><br/>" % (sql_plan_monitor_detail_v1))
-
                 t = time.localtime(time.time())
-                self.__report("报告生成时间： %s" % (time.strftime("%Y-%m-%d %H:%M:%S", t)))
+                self.__report(
+                    "<h4>本报告在租户下使用的 SQL</h4>"
+                    + _SQL_HELP_HTML.format(label="DFO 级", sql=sql_plan_monitor_dfo_op)
+                    + _SQL_HELP_HTML.format(label="机器级", sql=sql_plan_monitor_svr_agg_v1)
+                    + _SQL_HELP_HTML.format(label="线程级", sql=sql_plan_monitor_detail_v1)
+                    + f"报告生成时间： {time.strftime('%Y-%m-%d %H:%M:%S', t)}"
+                )
                 self.report_footer()
                 self.stdio.verbose("report footer complete")
             else:
@@ -195,21 +307,20 @@ class GatherPlanMonitorHandler(object):
             if resp["skip"]:
                 return
             if resp["error"]:
-                gather_tuples.append((cluster_name, True, resp["error_msg"], 0, int(time.time() - st), "Error:{0}".format(resp["error_msg"]), ""))
+                gather_tuples.append((cluster_name, True, resp["error_msg"], 0, (time.perf_counter_ns() - st) // 1000000000, "Error:{0}".format(resp["error_msg"]), ""))
                 return
             gather_pack_path_dict[cluster_name] = resp["gather_pack_path"]
-            gather_tuples.append((cluster_name, False, "", int(time.time() - st), pack_dir_this_command))
+            gather_tuples.append((cluster_name, False, "", (time.perf_counter_ns() - st) // 1000000000, pack_dir_this_command))
 
-        if getattr(sys, 'frozen', False):
-            absPath = os.path.dirname(sys.executable)
-        else:
-            absPath = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        cs_resources_path = os.path.join(absPath, "resources")
-        self.stdio.verbose("[cs resource path] : {0}".format(cs_resources_path))
+        self.stdio.verbose("[cs resource path] : {0}".format(CS_RESOURCES_PATH))
         target_resources_path = os.path.join(pack_dir_this_command, "resources")
-        self.copy_cs_resource(cs_resources_path, target_resources_path)
+        self.copy_cs_resource(CS_RESOURCES_PATH, target_resources_path)
         self.stdio.verbose("[sql plan monitor report task] start")
-        handle_plan_monitor_from_ob(self.ob_cluster_name)
+        try:
+            handle_plan_monitor_from_ob(self.ob_cluster_name)
+        finally:
+            self.__close_prefetch()
+            self.__flush_report()
         self.stdio.verbose("[sql plan monitor report task] end")
         summary_tuples = self.__get_overall_summary(gather_tuples)
         self.stdio.print(summary_tuples)
@@ -251,165 +362,155 @@ class GatherPlanMonitorHandler(object):
 
     def report_schema(self, sql):
         try:
-            schemas = ""
+            schemas = []
             valid_words = []
             if self.enable_dump_db:
-                words = [w.strip(',') for w in ("%s" % sql).split() if not ("[" in w or "=" in w or "|" in w or "(" in w or "--" in w or "]" in w or ")" in w or "*" in w or "/" in w or "%" in w or "'" in w or "-" in w or w.isdigit())]
+                words = [w.strip(',') for w in str(sql).split() if not ("[" in w or "=" in w or "|" in w or "(" in w or "--" in w or "]" in w or ")" in w or "*" in w or "/" in w or "%" in w or "'" in w or "-" in w or w.isdigit())]
                 for t in words:
-                    if t in valid_words:
+                    if t in valid_words or t.lower() in _SQL_KEYWORDS:
                         continue
                     valid_words.append(t)
                 for t in valid_words:
                     try:
-                        data = self.db_connector.execute_sql("show create table %s" % t)
-                        schemas = schemas + "<pre style='margin:20px;border:1px solid gray;'>{0}</pre>".format(data[0][1])
-                        self.stdio.verbose("table schema: {0}".format(schemas))
+                        schema_cursor = self.db_connector.execute_sql_return_cursor(f"show create table {t}")
+                        try:
+                            row = schema_cursor.fetchone()
+                        finally:
+                            schema_cursor.close()
+                        if row is None:
+                            continue
+                        table_schema = row[1]
+                        schemas.append(_PRE_HTML.format(table_schema))
+                        self.stdio.verbose("table schema: %s", table_schema)
                     except Exception as e:
                         pass
             cursor = self.sys_connector.execute_sql_return_cursor("show variables like '%parallel%'")
-            s = from_db_cursor(cursor)
-            s.align = 'l'
-            schemas = schemas + "<pre style='margin:20px;border:1px solid gray;'>%s</pre>" % s
-
+            schemas.append(self.__pre_table(cursor))
             cursor.execute("show variables")
-            s = from_db_cursor(cursor)
-            s.align = 'l'
-            schemas = schemas + "<pre style='margin:20px;border:1px solid gray;'>%s</pre>" % s
-
+            schemas.append(self.__pre_table(cursor))
             cursor.execute("show parameters")
-            s = from_db_cursor(cursor)
-            s.align = 'l'
-            schemas = schemas + "<pre style='margin:20px;border:1px solid gray;'>%s</pre>" % s
-            self.__report("<div><h2 id='schema_anchor'>SCHEMA 信息</h2><div id='schema' style='display: none'>" + schemas + "</div></div>")
+            schemas.append(self.__pre_table(cursor))
             cursor.close()
+            self.__report("<div><h2 id='schema_anchor'>SCHEMA 信息</h2><div id='schema' style='display: none'>" + "".join(schemas) + "</div></div>")
         except Exception as e:
             self.stdio.exception("report table schema failed %s" % sql)
             self.stdio.exception(repr(e))
             pass
 
+    @staticmethod
+    def __pre_table(cursor):
+        s = from_db_cursor(cursor)
+        s.align = 'l'
+        return _PRE_HTML.format(s)
+
     def report_pre(self, s):
-        pre = f'''<pre style='margin:20px;border:1px solid gray;'>{s}</pre>'''
-        self.__report(pre)
+        self.__report(_PRE_HTML.format(s))
 
     def report_header(self):
         header = GlobalHtmlMeta().get_value(key="sql_plan_monitor_report_header")
-        with open(self.report_file_path, 'w') as f:
-            f.write(header)
+        self.report_buf = [header]
         self.stdio.verbose("report header complete")
 
     def init_monitor_stat(self):
         sql = "select ID,NAME,TYPE from " + ("SYS." if self.tenant_mode == "oracle" else "oceanbase.") + "v$sql_monitor_statname order by ID"
         data = self.sys_connector.execute_sql(sql)
         for item in data:
-            self.STAT_NAME[item[0]] = {"type": item[2], "name": item[1]}
+            self.STAT_NAME[item[0]] = (item[2], item[1])
         self.stdio.verbose("init sql plan monitor stat complete")
 
-    def otherstat_detail_explain_item(self, item, n, v):
-        try:
-            if 0 == item[n]:
-                val = ""
-            elif self.STAT_NAME[item[n]]["type"] <= 1:
-                val = str(item[v])
-            elif self.STAT_NAME[item[n]]["type"] == 2:
-                val = "%0.3fMB" % (item[n + 1] / 1024.0 / 1024)
-            elif self.STAT_NAME[item[n]]["type"] == 3:
-                val = "%s.%06d" % (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(item[v] / 1000000)), item[v] - (item[v] / 1000000) * 1000000)
-            else:
-                val = str(item[v])
-        except Exception as e:
-            val = str(item[v])
-        return "" if item[n] == 0 else self.STAT_NAME[item[n]]["name"] + "(" + val + ");<br/>"
-
-    def otherstat_agg_explain_item(self, item, n, v):
-        try:
-            if 0 == item[n]:
-                val = None
-            elif self.STAT_NAME[item[n]]["type"] <= 1:
-                val = str(item[v])
-            elif self.STAT_NAME[item[n]]["type"] == 2:
-                val = "%0.3fMB" % (float(item[v]) / 1024.0 / 1024)
-            else:
-                val = None
-        except Exception as e:
-            val = str(item[v])
-        return "" if val == None else self.STAT_NAME[item[n]]["name"] + "(" + val + ");<br/>"
+    def __otherstat_explain(self, item, columns, formatters, default_formatter):
+        stat_name = self.STAT_NAME
+        parts = []
+        for n, v in columns:
+            stat_id = item[n]
+            if stat_id == 0:
+                continue
+            stat = stat_name.get(stat_id)
+            if stat is None:
+                continue
+            stat_type, name = stat
+            formatter = formatters.get(stat_type, default_formatter)
+            if formatter is None:
+                continue
+            value = item[v]
+            try:
+                val = formatter(value)
+            except Exception as e:
+                val = str(value)
+            parts.append(name + "(" + val + ");<br/>")
+        return "".join(parts)
 
     def detail_otherstat_explain(self, item):
-        otherstat = ""
-        otherstat += self.otherstat_detail_explain_item(item, "OTHERSTAT_1_ID", "OTHERSTAT_1_VALUE")
-        otherstat += self.otherstat_detail_explain_item(item, "OTHERSTAT_2_ID", "OTHERSTAT_2_VALUE")
-        otherstat += self.otherstat_detail_explain_item(item, "OTHERSTAT_3_ID", "OTHERSTAT_3_VALUE")
-        otherstat += self.otherstat_detail_explain_item(item, "OTHERSTAT_4_ID", "OTHERSTAT_4_VALUE")
-        otherstat += self.otherstat_detail_explain_item(item, "OTHERSTAT_5_ID", "OTHERSTAT_5_VALUE")
-        otherstat += self.otherstat_detail_explain_item(item, "OTHERSTAT_6_ID", "OTHERSTAT_6_VALUE")
-        return otherstat
+        return self.__otherstat_explain(item, _DETAIL_OTHERSTAT_COLUMNS, _DETAIL_OTHERSTAT_FORMATTERS, str)
 
     def dfo_otherstat_explain(self, item):
-        otherstat = ""
-        otherstat += self.otherstat_agg_explain_item(item, "OTHERSTAT_1_ID", "SUM_STAT_1")
-        otherstat += self.otherstat_agg_explain_item(item, "OTHERSTAT_2_ID", "SUM_STAT_2")
-        otherstat += self.otherstat_agg_explain_item(item, "OTHERSTAT_3_ID", "SUM_STAT_3")
-        otherstat += self.otherstat_agg_explain_item(item, "OTHERSTAT_4_ID", "SUM_STAT_4")
-        otherstat += self.otherstat_agg_explain_item(item, "OTHERSTAT_5_ID", "SUM_STAT_5")
-        otherstat += self.otherstat_agg_explain_item(item, "OTHERSTAT_6_ID", "SUM_STAT_6")
-        return otherstat
+        return self.__otherstat_explain(item, _AGG_OTHERSTAT_COLUMNS, _AGG_OTHERSTAT_FORMATTERS, None)
 
     def report_detail_graph_data(self, ident, cursor, title=''):
-        data = "<script> var %s = [" % ident
+        data = ["<script> var %s = [" % ident]
+        append = data.append
         for item in cursor:
-            start = 0 if None == item['FIRST_CHANGE_TS'] else item['FIRST_CHANGE_TS']
-            end = 0 if None == item['LAST_CHANGE_TS'] else item['LAST_CHANGE_TS']
-            rows = 0 if None == item['OUTPUT_ROWS'] else item['OUTPUT_ROWS']
+            start = item['FIRST_CHANGE_TS'] or 0
+            end = item['LAST_CHANGE_TS'] or 0
+            rows = item['OUTPUT_ROWS'] or 0
             otherstat = self.detail_otherstat_explain(item)
-            data = data + "{start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d, tag:'op', depth:%d, rescan:%d, svr_ip:'%s', otherstat:'%s'}," % (
-                start,
-                end,
-                end - start,
-                item['PLAN_LINE_ID'],
-                item['PLAN_OPERATION'],
-                item['PROCESS_NAME'],
-                rows,
-                item['PLAN_DEPTH'],
-                item['RESCAN_TIMES'],
-                item['SVR_IP'],
-                otherstat,
+            append(
+                "{start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d, tag:'op', depth:%d, rescan:%d, svr_ip:'%s', otherstat:'%s'},"
+                % (
+                    start,
+                    end,
+                    end - start,
+                    item['PLAN_LINE_ID'],
+                    item['PLAN_OPERATION'],
+                    item['PROCESS_NAME'],
+                    rows,
+                    item['PLAN_DEPTH'],
+                    item['RESCAN_TIMES'],
+                    item['SVR_IP'],
+                    otherstat,
+                )
             )
-        data = data + "{start:0}];</script>"
-        data = data + "<p>%s</p><div class='bar' id='%s'></div>" % (title, ident)
-        self.__report(data)
+        append("{start:0}];</script>")
+        append("<p>%s</p><div class='bar' id='%s'></div>" % (title, ident))
+        self.__report_lines(data)
 
     def report_detail_graph_data_obversion4(self, ident, cursor, title=''):
-        data = "<script> var %s = [" % ident
+        data = ["<script> var %s = [" % ident]
+        append = data.append
         for item in cursor:
-            start = 0 if None == item['FIRST_CHANGE_TS'] else item['FIRST_CHANGE_TS']
-            end = 0 if None == item['LAST_CHANGE_TS'] else item['LAST_CHANGE_TS']
-            rows = 0 if None == item['OUTPUT_ROWS'] else item['OUTPUT_ROWS']
+            start = item['FIRST_CHANGE_TS'] or 0
+            end = item['LAST_CHANGE_TS'] or 0
+            rows = item['OUTPUT_ROWS'] or 0
             otherstat = self.detail_otherstat_explain(item)
-            data = data + "{cpu:%f, io:%f, start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d, tag:'op', depth:%d, rescan:%d, svr_ip:'%s', otherstat:'%s'}," % (
-                item['MY_CPU_TIME'],
-                item['MY_IO_TIME'],
-                start,
-                end,
-                end - start,
-                item['PLAN_LINE_ID'],
-                item['PLAN_OPERATION'],
-                item['PROCESS_NAME'],
-                rows,
-                item['PLAN_DEPTH'],
-                item['RESCAN_TIMES'],
-                item['SVR_IP'],
-                otherstat,
+            append(
+                "{cpu:%f, io:%f, start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d, tag:'op', depth:%d, rescan:%d, svr_ip:'%s', otherstat:'%s'},"
+                % (
+                    item['MY_CPU_TIME'],
+                    item['MY_IO_TIME'],
+                    start,
+                    end,
+                    end - start,
+                    item['PLAN_LINE_ID'],
+                    item['PLAN_OPERATION'],
+                    item['PROCESS_NAME'],
+                    rows,
+                    item['PLAN_DEPTH'],
+                    item['RESCAN_TIMES'],
+                    item['SVR_IP'],
+                    otherstat,
+                )
             )
-        data = data + "{start:0}];</script>"
-        data = data + "<p>%s</p><div class='bar' id='%s'></div>" % (title, ident)
-        self.__report(data)
+        append("{start:0}];</script>")
+        append("<p>%s</p><div class='bar' id='%s'></div>" % (title, ident))
+        self.__report_lines(data)
 
     # dfo db time
     def report_dfo_agg_db_time_graph_data_obversion4(self, cursor, title=''):
-        data = "<script> var db_time_serial = ["
+        data = ["<script> var db_time_serial = ["]
+        append = data.append
+        start = 0.00001
         for item in cursor:
-            start = Decimal('0.00001')
-            end = item['MY_DB_TIME'] + start
+            end = float(item['MY_DB_TIME']) + start
             diff = end - start  # db time diff
             rows = item['TOTAL_OUTPUT_ROWS']
             op_id = item['PLAN_LINE_ID']
@@ -420,187 +521,213 @@ class GatherPlanMonitorHandler(object):
             my_cpu_time = item['MY_CPU_TIME']
             my_io_time = item['MY_IO_TIME']
             otherstat = "my_db_time:%f, my_cpu_time:%f, my_io_time:%f" % (item['MY_DB_TIME'], item['MY_CPU_TIME'], item['MY_IO_TIME'])
-            data = data + "{cpu:%f,io:%f,start:%f, end:%f, diff:%f, my_io_time:%f, my_cpu_time:%f, opid:%s, op:'%s', est_rows:0, rows:%d, tag:'db_time', tid: %d, depth:%d, otherstat:'%s'}," % (
-                item['MY_CPU_TIME'],
-                item['MY_IO_TIME'],
-                start,
-                end,
-                diff,
-                my_io_time,
-                my_cpu_time,
-                op_id,
-                op,
-                rows,
-                threads,
-                depth,
-                otherstat,
+            append(
+                "{cpu:%f,io:%f,start:%f, end:%f, diff:%f, my_io_time:%f, my_cpu_time:%f, opid:%s, op:'%s', est_rows:0, rows:%d, tag:'db_time', tid: %d, depth:%d, otherstat:'%s'},"
+                % (
+                    item['MY_CPU_TIME'],
+                    item['MY_IO_TIME'],
+                    start,
+                    end,
+                    diff,
+                    my_io_time,
+                    my_cpu_time,
+                    op_id,
+                    op,
+                    rows,
+                    threads,
+                    depth,
+                    otherstat,
+                )
             )
-        data = data + "{start:0}];"
-        data = data + "</script><p>%s</p><div class='bar' id='db_time_serial'></div>" % (title)
-        self.__report(data)
+        append("{start:0}];")
+        append("</script><p>%s</p><div class='bar' id='db_time_serial'></div>" % (title))
+        self.__report_lines(data)
 
     def report_dfo_agg_graph_data(self, cursor, title=''):
-        data = "<script> var agg_serial = ["
+        data = ["<script> var agg_serial = ["]
+        append = data.append
         for item in cursor:
-            start = 0 if None == item['MIN_FIRST_CHANGE_TS'] else item['MIN_FIRST_CHANGE_TS']
-            end = 0 if None == item['MAX_LAST_CHANGE_TS'] else item['MAX_LAST_CHANGE_TS']
-            rows = 0 if None == item['TOTAL_OUTPUT_ROWS'] else item['TOTAL_OUTPUT_ROWS']
-            est_rows = 0 if None == item['EST_ROWS'] else item['EST_ROWS']
+            start = item['MIN_FIRST_CHANGE_TS'] or 0
+            end = item['MAX_LAST_CHANGE_TS'] or 0
+            rows = item['TOTAL_OUTPUT_ROWS'] or 0
+            est_rows = item['EST_ROWS'] or 0
             otherstat = self.dfo_otherstat_explain(item)
-            data = data + "{start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d,est_rows:%d, tag:'dfo', depth:%d, otherstat:'%s'}," % (
-                start,
-                end,
-                end - start,
-                item['PLAN_LINE_ID'],
-                item['PLAN_OPERATION'],
-                item['PARALLEL'],
-                rows,
-                est_rows,
-                item['PLAN_DEPTH'],
-                otherstat,
+            append(
+                "{start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d,est_rows:%d, tag:'dfo', depth:%d, otherstat:'%s'},"
+                % (
+                    start,
+                    end,
+                    end - start,
+                    item['PLAN_LINE_ID'],
+                    item['PLAN_OPERATION'],
+                    item['PARALLEL'],
+                    rows,
+                    est_rows,
+                    item['PLAN_DEPTH'],
+                    otherstat,
+                )
             )
-        data = data + "{start:0}];"
-        data = data + "</script><p>%s</p><div class='bar' id='agg_serial'></div>" % (title)
-        self.__report(data)
+        append("{start:0}];")
+        append("</script><p>%s</p><div class='bar' id='agg_serial'></div>" % (title))
+        self.__report_lines(data)
 
     def report_dfo_agg_graph_data_obversion4(self, cursor, title=''):
-        data = "<script> var agg_serial = ["
+        data = ["<script> var agg_serial = ["]
+        append = data.append
         for item in cursor:
-            start = 0 if None == item['MIN_FIRST_CHANGE_TS'] else item['MIN_FIRST_CHANGE_TS']
-            end = 0 if None == item['MAX_LAST_CHANGE_TS'] else item['MAX_LAST_CHANGE_TS']
-            rows = 0 if None == item['TOTAL_OUTPUT_ROWS'] else item['TOTAL_OUTPUT_ROWS']
-            skewness = 0 if None == item['SKEWNESS'] else item['SKEWNESS']
-            est_rows = 0 if None == item['EST_ROWS'] else item['EST_ROWS']
+            start = item['MIN_FIRST_CHANGE_TS'] or 0
+            end = item['MAX_LAST_CHANGE_TS'] or 0
+            rows = item['TOTAL_OUTPUT_ROWS'] or 0
+            skewness = item['SKEWNESS'] or 0
+            est_rows = item['EST_ROWS'] or 0
             otherstat = self.dfo_otherstat_explain(item)
-            data = data + "{cpu:%f,io:%f,start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d,est_rows:%d, tag:'dfo', depth:%d, otherstat:'%s', skewness:%.2f}," % (
-                item['MY_CPU_TIME'],
-                item['MY_IO_TIME'],
-                start,
-                end,
-                end - start,
-                item['PLAN_LINE_ID'],
-                item['PLAN_OPERATION'],
-                item['PARALLEL'],
-                rows,
-                est_rows,
-                item['PLAN_DEPTH'],
-                otherstat,
-                skewness,
+            append(
+                "{cpu:%f,io:%f,start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d,est_rows:%d, tag:'dfo', depth:%d, otherstat:'%s', skewness:%.2f},"
+                % (
+                    item['MY_CPU_TIME'],
+                    item['MY_IO_TIME'],
+                    start,
+                    end,
+                    end - start,
+                    item['PLAN_LINE_ID'],
+                    item['PLAN_OPERATION'],
+                    item['PARALLEL'],
+                    rows,
+                    est_rows,
+                    item['PLAN_DEPTH'],
+                    otherstat,
+                    skewness,
+                )
             )
-        data = data + "{start:0}];"
-        data = data + "</script><p>%s</p><div class='bar' id='agg_serial'></div>" % (title)
-        self.__report(data)
+        append("{start:0}];")
+        append("</script><p>%s</p><div class='bar' id='agg_serial'></div>" % (title))
+        self.__report_lines(data)
 
     def report_dfo_sched_agg_graph_data(self, cursor, title=''):
-        data = "<script> var agg_sched_serial = ["
+        data = ["<script> var agg_sched_serial = ["]
+        append = data.append
         for item in cursor:
-            start = 0 if None == item['MIN_FIRST_REFRESH_TS'] else item['MIN_FIRST_REFRESH_TS']
-            end = 0 if None == item['MAX_LAST_REFRESH_TS'] else item['MAX_LAST_REFRESH_TS']
-            rows = 0 if None == item['TOTAL_OUTPUT_ROWS'] else item['TOTAL_OUTPUT_ROWS']
-            est_rows = 0 if None == item['EST_ROWS'] else item['EST_ROWS']
+            start = item['MIN_FIRST_REFRESH_TS'] or 0
+            end = item['MAX_LAST_REFRESH_TS'] or 0
+            rows = item['TOTAL_OUTPUT_ROWS'] or 0
+            est_rows = item['EST_ROWS'] or 0
             otherstat = self.dfo_otherstat_explain(item)
-            data = data + "{start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d,est_rows:%d, tag:'dfo', " "depth:%d, otherstat:'%s'}," % (
-                start,
-                end,
-                end - start,
-                item['PLAN_LINE_ID'],
-                item['PLAN_OPERATION'],
-                item['PARALLEL'],
-                rows,
-                est_rows,
-                item['PLAN_DEPTH'],
-                otherstat,
+            append(
+                "{start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d,est_rows:%d, tag:'dfo', "
+                "depth:%d, otherstat:'%s'},"
+                % (
+                    start,
+                    end,
+                    end - start,
+                    item['PLAN_LINE_ID'],
+                    item['PLAN_OPERATION'],
+                    item['PARALLEL'],
+                    rows,
+                    est_rows,
+                    item['PLAN_DEPTH'],
+                    otherstat,
+                )
             )
-        data = data + "{start:0}];"
-        data = data + "</script><p>%s</p><div class='bar' id='agg_sched_serial'></div>" % (title)
-        self.__report(data)
+        append("{start:0}];")
+        append("</script><p>%s</p><div class='bar' id='agg_sched_serial'></div>" % (title))
+        self.__report_lines(data)
 
     def report_dfo_sched_agg_graph_data_obversion4(self, cursor, title=''):
-        data = "<script> var agg_sched_serial = ["
+        data = ["<script> var agg_sched_serial = ["]
+        append = data.append
         for item in cursor:
-            start = 0 if None == item['MIN_FIRST_REFRESH_TS'] else item['MIN_FIRST_REFRESH_TS']
-            end = 0 if None == item['MAX_LAST_REFRESH_TS'] else item['MAX_LAST_REFRESH_TS']
-            rows = 0 if None == item['TOTAL_OUTPUT_ROWS'] else item['TOTAL_OUTPUT_ROWS']
-            skewness = 0 if None == item['SKEWNESS'] else item['SKEWNESS']
-            est_rows = 0 if None == item['EST_ROWS'] else item['EST_ROWS']
+            start = item['MIN_FIRST_REFRESH_TS'] or 0
+            end = item['MAX_LAST_REFRESH_TS'] or 0
+            rows = item['TOTAL_OUTPUT_ROWS'] or 0
+            skewness = item['SKEWNESS'] or 0
+            est_rows = item['EST_ROWS'] or 0
             otherstat = self.dfo_otherstat_explain(item)
-            data = data + "{cpu:%f,io:%f,start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d,est_rows:%d, " "tag:'dfo', depth:%d, otherstat:'%s', skewness:%.2f}," % (
-                item['MY_CPU_TIME'],
-                item['MY_IO_TIME'],
-                start,
-                end,
-                end - start,
-                item['PLAN_LINE_ID'],
-                item['PLAN_OPERATION'],
-                item['PARALLEL'],
-                rows,
-                est_rows,
-                item['PLAN_DEPTH'],
-                otherstat,
-                skewness,
+            append(
+                "{cpu:%f,io:%f,start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',rows:%d,est_rows:%d, "
+                "tag:'dfo', depth:%d, otherstat:'%s', skewness:%.2f},"
+                % (
+                    item['MY_CPU_TIME'],
+                    item['MY_IO_TIME'],
+                    start,
+                    end,
+                    end - start,
+                    item['PLAN_LINE_ID'],
+                    item['PLAN_OPERATION'],
+                    item['PARALLEL'],
+                    rows,
+                    est_rows,
+                    item['PLAN_DEPTH'],
+                    otherstat,
+                    skewness,
+                )
             )
-        data = data + "{start:0}];"
-        data = data + "</script><p>%s</p><div class='bar' id='agg_sched_serial'></div>" % (title)
-        self.__report(data)
+        append("{start:0}];")
+        append("</script><p>%s</p><div class='bar' id='agg_sched_serial'></div>" % (title))
+        self.__report_lines(data)
 
     # sqc，辅助查询协调者
     def report_svr_agg_graph_data(self, ident, cursor, title=''):
-        data = "<script> var %s = [" % ident
+        data = ["<script> var %s = [" % ident]
+        append = data.append
         for item in cursor:
-            start = 0 if None == item['MIN_FIRST_CHANGE_TS'] else item['MIN_FIRST_CHANGE_TS']
-            end = 0 if None == item['MAX_LAST_CHANGE_TS'] else item['MAX_LAST_CHANGE_TS']
-            rows = 0 if None == item['TOTAL_OUTPUT_ROWS'] else item['TOTAL_OUTPUT_ROWS']
-            data = data + "{start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',svr:'%s',rows:%d, " "tag:'sqc', depth:%d}," % (
-                start,
-                end,
-                end - start,
-                item['PLAN_LINE_ID'],
-                item['PLAN_OPERATION'],
-                item['PARALLEL'],
-                item['SVR_IP'] + ':' + str(item['SVR_PORT']),
-                rows,
-                item['PLAN_DEPTH'],
+            start = item['MIN_FIRST_CHANGE_TS'] or 0
+            end = item['MAX_LAST_CHANGE_TS'] or 0
+            rows = item['TOTAL_OUTPUT_ROWS'] or 0
+            append(
+                "{start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',svr:'%s:%s',rows:%d, "
+                "tag:'sqc', depth:%d},"
+                % (
+                    start,
+                    end,
+                    end - start,
+                    item['PLAN_LINE_ID'],
+                    item['PLAN_OPERATION'],
+                    item['PARALLEL'],
+                    item['SVR_IP'],
+                    item['SVR_PORT'],
+                    rows,
+                    item['PLAN_DEPTH'],
+                )
             )
-        data = data + "{start:0}];</script>"
-        data = data + "<p>%s</p><div class='bar' id='%s'></div>" % (title, ident)
-        self.stdio.verbose("report SQL_PLAN_MONITOR SQC operator priority start, DATA: %s", data)
-        self.__report(data)
+        append("{start:0}];</script>")
+        append("<p>%s</p><div class='bar' id='%s'></div>" % (title, ident))
+        self.stdio.verbose("report SQL_PLAN_MONITOR SQC operator priority start, ident: %s", ident)
+        self.__report_lines(data)
 
     def report_svr_agg_graph_data_obversion4(self, ident, cursor, title=''):
-        data = "<script> var %s = [" % ident
+        data = ["<script> var %s = [" % ident]
+        append = data.append
         for item in cursor:
-            start = 0 if None == item['MIN_FIRST_CHANGE_TS'] else item['MIN_FIRST_CHANGE_TS']
-            end = 0 if None == item['MAX_LAST_CHANGE_TS'] else item['MAX_LAST_CHANGE_TS']
-            rows = 0 if None == item['TOTAL_OUTPUT_ROWS'] else item['TOTAL_OUTPUT_ROWS']
-            skewness = 0 if None == item['SKEWNESS'] else item['SKEWNESS']
-            data = data + "{cpu:%f,io:%f,start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',svr:'%s',rows:%d, " "tag:'sqc', depth:%d, skewness:%.2f}," % (
-                item['MY_CPU_TIME'],
-                item['MY_IO_TIME'],
-                start,
-                end,
-                end - start,
-                item['PLAN_LINE_ID'],
-                item['PLAN_OPERATION'],
-                item['PARALLEL'],
-                item['SVR_IP'] + ':' + str(item['SVR_PORT']),
-                rows,
-                item['PLAN_DEPTH'],
-                skewness,
+            start = item['MIN_FIRST_CHANGE_TS'] or 0
+            end = item['MAX_LAST_CHANGE_TS'] or 0
+            rows = item['TOTAL_OUTPUT_ROWS'] or 0
+            skewness = item['SKEWNESS'] or 0
+            append(
+                "{cpu:%f,io:%f,start:%f, end:%f, diff:%f, opid:%s, op:'%s',tid:'%s',svr:'%s:%s',rows:%d, "
+                "tag:'sqc', depth:%d, skewness:%.2f},"
+                % (
+                    item['MY_CPU_TIME'],
+                    item['MY_IO_TIME'],
+                    start,
+                    end,
+                    end - start,
+                    item['PLAN_LINE_ID'],
+                    item['PLAN_OPERATION'],
+                    item['PARALLEL'],
+                    item['SVR_IP'],
+                    item['SVR_PORT'],
+                    rows,
+                    item['PLAN_DEPTH'],
+                    skewness,
+                )
             )
-        data = data + "{start:0}];</script>"
-        data = data + "<p>%s</p><div class='bar' id='%s'></div>" % (title, ident)
-        self.stdio.verbose("report SQL_PLAN_MONITOR SQC operator priority start, DATA: %s", data)
-        self.__report(data)
+        append("{start:0}];</script>")
+        append("<p>%s</p><div class='bar' id='%s'></div>" % (title, ident))
+        self.stdio.verbose("report SQL_PLAN_MONITOR SQC operator priority start, ident: %s", ident)
+        self.__report_lines(data)
 
     def report_fast_preview(self):
-        content = '''
-        <script>
-        generate_graph("dfo", agg_serial, $('#agg_serial'));
-        generate_graph("dfo", agg_sched_serial, $('#agg_sched_serial'));
-        generate_graph("sqc", svr_agg_serial_v1, $('#svr_agg_serial_v1'));
-        generate_graph("sqc", svr_agg_serial_v2, $('#svr_agg_serial_v2'));
-        </script>
-        '''
+        content = GlobalHtmlMeta().get_value(key="sql_plan_monitor_report_fast_preview")
         self.__report(content)
         self.stdio.verbose("report SQL_PLAN_MONITOR fast preview complete")
 
@@ -608,19 +735,64 @@ class GatherPlanMonitorHandler(object):
         footer = GlobalHtmlMeta().get_value(key="sql_plan_monitor_report_footer")
         self.__report(footer)
 
+    def __report_section_page(self, file_name, title, table):
+        """
+        write a large table to its own page next to the report, so the browser only parses it when it is opened
+        :param file_name: page file name, relative to the report
+        :param title: page title
+        :param table: PrettyTable to put on the page
+        :return: link to the page for the main report
+        """
+        content = table.get_html_string(attributes={"class": "table table-bordered table-striped"})
+        page = GlobalHtmlMeta().get_value(key="sql_plan_monitor_report_section_page").replace("##REPLACE_TITLE##", title).replace("##REPLACE_CONTENT##", content)
+        # written like __flush_report, as utf-8 text
+        with open(os.path.join(os.path.dirname(self.report_file_path), file_name), 'w', encoding='utf-8') as f:
+            f.write(page)
+        return f"<a href='./{file_name}' target='_blank'>{file_name} ({len(table.rows)} rows)</a>"
+
+    def __inline_table_html(self, columns, rows, file_name, title):
+        """
+        html of a report table, used by both the SQC summary and the detail table. Up to REPORT_INLINE_TABLE_MAX_ROWS rows it is inlined as a whole,
+        a longer one is inlined as its first and last REPORT_INLINE_TABLE_MAX_ROWS // 2 rows and the full table goes to file_name next to the report
+        :param file_name: page file name for the full table, relative to the report
+        :param title: title of that page
+        :return: html for the main report
+        """
+        if len(rows) <= REPORT_INLINE_TABLE_MAX_ROWS:
+            return self.__pretty_table(columns, rows).get_html_string()
+        half = REPORT_INLINE_TABLE_MAX_ROWS // 2
+        gap = ["..."] * len(columns)
+        gap[0] = f"({len(rows) - 2 * half} rows hidden)"
+        inline_table = self.__pretty_table(columns, list(rows[:half]) + [gap] + list(rows[-half:]))
+        return inline_table.get_html_string() + self.__report_section_page(file_name, title, self.__pretty_table(columns, rows))
+
     def __report(self, s):
-        with open(self.report_file_path, 'a') as f:
-            f.write(s)
+        self.report_buf.append(s)
+
+    def __report_lines(self, lines):
+        self.report_buf.extend(lines)
+
+    def __flush_report(self):
+        if not self.report_buf:
+            return
+        # the report declares <meta charset="utf-8">. writelines streams the pieces through the file buffer,
+        # no full-document str or bytes copy of the report is built
+        with open(self.report_file_path, 'w', encoding='utf-8') as f:
+            f.writelines(self.report_buf)
+        self.report_buf = []
 
     def tenant_mode_detected(self):
+        cache_key = (self.db_connector.ip, self.db_connector.port, self.db_connector.username)
+        if cache_key in _tenant_mode_cache:
+            self.sql_audit_name, self.plan_explain_name, self.ob_major_version, self.tenant_mode, self.sys_database = _tenant_mode_cache[cache_key]
+            return True
         try:
             # Detect MySQL mode
             data = self.db_connector.execute_sql("show variables like 'version_comment'")
             for row in data:
                 ob_version = row[1]
 
-            version_pattern = r'(?:OceanBase(_CE)?\s+)?(\d+\.\d+\.\d+\.\d+)'
-            matched_version = re.search(version_pattern, ob_version)
+            matched_version = _MYSQL_VERSION_COMMENT_RE.search(ob_version)
 
             if matched_version:
                 version = matched_version.group(2)
@@ -633,6 +805,7 @@ class GatherPlanMonitorHandler(object):
                 self.sys_database = "oceanbase"
 
                 self.stdio.verbose(f"Detected MySQL mode successful, Database version: {ob_version}")
+                _tenant_mode_cache[cache_key] = (self.sql_audit_name, self.plan_explain_name, self.ob_major_version, self.tenant_mode, self.sys_database)
                 return True
             else:
                 raise ValueError("Failed to match MySQL version")
@@ -642,8 +815,7 @@ class GatherPlanMonitorHandler(object):
                 data = self.sys_connector.execute_sql("select SUBSTR(BANNER, 11, 100) from V$VERSION;")
                 banner = data[0][0]
 
-                version_pattern = r'(\d+\.\d+\.\d+\.\d+)'
-                matched_version = re.search(version_pattern, banner)
+                matched_version = _ORACLE_BANNER_VERSION_RE.search(banner)
 
                 if matched_version:
                     version = matched_version.group(1)
@@ -655,6 +827,7 @@ class GatherPlanMonitorHandler(object):
                     self.sys_database = "SYS"
 
                     self.stdio.verbose(f"Detected Oracle mode successful, Database version: {version}")
+                    _tenant_mode_cache[cache_key] = (self.sql_audit_name, self.plan_explain_name, self.ob_major_version, self.tenant_mode, self.sys_database)
                     return True
                 else:
                     raise ValueError("Failed to match Oracle version")
@@ -673,18 +846,91 @@ class GatherPlanMonitorHandler(object):
         return resp
 
     def copy_cs_resource(self, source_path, target_path):
-        shutil.copytree(source_path, target_path)
+        shutil.copytree(source_path, target_path, copy_function=_link_or_copy, dirs_exist_ok=True)
+
+    def __prefetch_sys_sql(self, sqls):
+        """
+        run the sys tenant queries concurrently on a small pool of connections, OBConnector is not thread safe so a connection is used by one worker at a time
+        :param sqls: the queries to run
+        :return: None, results are picked up by __sys_sql_result
+        """
+
+        def fetch(sql):
+            try:
+                connector = self.sys_sql_connectors.get_nowait()
+            except queue.Empty:
+                # at most max_workers connections are opened, one per busy worker
+                connector = OBConnector(
+                    ip=self.ob_cluster.get("db_host"), port=self.ob_cluster.get("db_port"), username=self.ob_cluster.get("tenant_sys").get("user"), password=self.ob_cluster.get("tenant_sys").get("password"), stdio=self.stdio, timeout=100
+                )
+            try:
+                return connector.execute_sql_return_columns_and_data(sql)
+            finally:
+                self.sys_sql_connectors.put(connector)
+
+        sqls = [sql for sql in dict.fromkeys(sqls) if sql not in self.sys_sql_futures]
+        if not sqls:
+            return
+        if self.sys_sql_executor is None:
+            self.sys_sql_executor = ThreadPoolExecutor(max_workers=min(SYS_SQL_PREFETCH_MAX_WORKERS, len(sqls)))
+        for sql in sqls:
+            self.sys_sql_futures[sql] = self.sys_sql_executor.submit(fetch, sql)
+
+    def __close_prefetch(self):
+        """
+        stop the prefetch workers and close their connections, also when a report section failed before the results were picked up
+        :return: None
+        """
+        if self.sys_sql_executor is None:
+            return
+        for future in self.sys_sql_futures.values():
+            future.cancel()
+        self.sys_sql_executor.shutdown(wait=True)
+        self.sys_sql_executor = None
+        for future in self.sys_sql_futures.values():
+            if not future.cancelled() and future.exception() is not None:
+                self.stdio.verbose("sql plan monitor prefetch failed: {0}".format(future.exception()))
+        self.sys_sql_futures = {}
+        while True:
+            try:
+                connector = self.sys_sql_connectors.get_nowait()
+            except queue.Empty:
+                break
+            if connector.conn is not None:
+                connector.conn.close()
+
+    def __sys_sql_result(self, sql):
+        future = self.sys_sql_futures.get(sql)
+        if future is None:
+            return self.sys_connector.execute_sql_return_columns_and_data(sql)
+        return future.result()
+
+    @staticmethod
+    def __pretty_table(columns, rows):
+        table = PrettyTable()
+        table.field_names = columns
+        for row in rows:
+            table.add_row(row)
+        return table
+
+    @staticmethod
+    def __dict_rows(columns, rows):
+        return [dict(zip(columns, row)) for row in rows]
 
     def sql_audit_by_trace_id_limit1_sql(self):
-        if self.tenant_mode == 'mysql':
-            sql = str(GlobalSqlMeta().get_value(key="sql_audit_by_trace_id_limit1_mysql")).replace("##REPLACE_TRACE_ID##", self.trace_id).replace("##REPLACE_SQL_AUDIT_TABLE_NAME##", self.sql_audit_name)
-        else:
-            sql = str(GlobalSqlMeta().get_value(key="sql_audit_by_trace_id_limit1_oracle")).replace("##REPLACE_TRACE_ID##", self.trace_id).replace("##REPLACE_SQL_AUDIT_TABLE_NAME##", self.sql_audit_name)
+        # --trace_id comes from the command line, it is bound as the query parameter instead of being pasted into the sql,
+        # so the statement only depends on the tenant mode and the sql_audit view and is built once
+        cache_key = (self.tenant_mode, self.sql_audit_name)
+        sql = self.sql_audit_limit1_sql_cache.get(cache_key)
+        if sql is None:
+            key = "sql_audit_by_trace_id_limit1_mysql" if self.tenant_mode == 'mysql' else "sql_audit_by_trace_id_limit1_oracle"
+            sql = _sql_meta.get_value(key=key).replace("'##REPLACE_TRACE_ID##'", "%s").replace("##REPLACE_SQL_AUDIT_TABLE_NAME##", self.sql_audit_name)
+            self.sql_audit_limit1_sql_cache[cache_key] = sql
         return sql
 
     def select_sql_audit_by_trace_id_limit1(self):
         sql = self.sql_audit_by_trace_id_limit1_sql()
-        result = self.sys_connector.execute_sql(sql)
+        result = self.sys_connector.execute_sql(sql, (self.trace_id,))
         return result
 
     def plan_explain_sql(self, tenant_id, plan_id, svr_ip, svr_port):
@@ -703,81 +949,33 @@ class GatherPlanMonitorHandler(object):
     def full_audit_sql_by_trace_id_sql(self, trace_id):
         if self.tenant_mode == 'mysql':
             if self.ob_major_version >= 4:
-                sql = "select /*+ sql_audit */ %s from oceanbase.%s where trace_id = '%s' " "AND client_ip IS NOT NULL ORDER BY QUERY_SQL ASC, REQUEST_ID" % (GlobalSqlMeta().get_value(key="sql_audit_item_mysql_obversion4"), self.sql_audit_name, trace_id)
+                sql = "select /*+ sql_audit */ %s from oceanbase.%s where trace_id = '%s' " "AND client_ip IS NOT NULL ORDER BY QUERY_SQL ASC, REQUEST_ID" % (_sql_meta.get_value(key="sql_audit_item_mysql_obversion4"), self.sql_audit_name, trace_id)
             else:
-                sql = "select /*+ sql_audit */ %s from oceanbase.%s where trace_id = '%s' " "AND client_ip IS NOT NULL ORDER BY QUERY_SQL ASC, REQUEST_ID" % (GlobalSqlMeta().get_value(key="sql_audit_item_mysql"), self.sql_audit_name, trace_id)
+                sql = "select /*+ sql_audit */ %s from oceanbase.%s where trace_id = '%s' " "AND client_ip IS NOT NULL ORDER BY QUERY_SQL ASC, REQUEST_ID" % (_sql_meta.get_value(key="sql_audit_item_mysql"), self.sql_audit_name, trace_id)
         else:
             if self.ob_major_version >= 4:
-                sql = "select /*+ sql_audit */ %s from sys.%s where trace_id = '%s' AND  " "length(client_ip) > 4 ORDER BY  REQUEST_ID" % (GlobalSqlMeta().get_value(key="sql_audit_item_oracle_obversion4"), self.sql_audit_name, trace_id)
+                sql = "select /*+ sql_audit */ %s from sys.%s where trace_id = '%s' AND  " "length(client_ip) > 4 ORDER BY  REQUEST_ID" % (_sql_meta.get_value(key="sql_audit_item_oracle_obversion4"), self.sql_audit_name, trace_id)
             else:
-                sql = "select /*+ sql_audit */ %s from sys.%s where trace_id = '%s' AND  " "length(client_ip) > 4 ORDER BY  REQUEST_ID" % (GlobalSqlMeta().get_value(key="sql_audit_item_oracle"), self.sql_audit_name, trace_id)
+                sql = "select /*+ sql_audit */ %s from sys.%s where trace_id = '%s' AND  " "length(client_ip) > 4 ORDER BY  REQUEST_ID" % (_sql_meta.get_value(key="sql_audit_item_oracle"), self.sql_audit_name, trace_id)
         return sql
 
-    def sql_plan_monitor_dfo_op_sql(self, tenant_id, plan_id, trace_id):
-        if self.tenant_mode == 'mysql':
-            if self.ob_major_version >= 4:
-                sql = (
-                    str(GlobalSqlMeta().get_value(key="sql_plan_monitor_dfo_op_mysql_obversion4"))
-                    .replace("##REPLACE_TRACE_ID##", trace_id)
-                    .replace("##REPLACE_PLAN_ID##", str(plan_id))
-                    .replace("##REPLACE_TENANT_ID##", str(tenant_id))
-                    .replace("##REPLACE_PLAN_EXPLAIN_TABLE_NAME##", self.plan_explain_name)
-                )
-            else:
-                sql = (
-                    str(GlobalSqlMeta().get_value(key="sql_plan_monitor_dfo_op_mysql"))
-                    .replace("##REPLACE_TRACE_ID##", trace_id)
-                    .replace("##REPLACE_PLAN_ID##", str(plan_id))
-                    .replace("##REPLACE_TENANT_ID##", str(tenant_id))
-                    .replace("##REPLACE_PLAN_EXPLAIN_TABLE_NAME##", self.plan_explain_name)
-                )
-        else:
-            if self.ob_major_version >= 4:
-                sql = (
-                    GlobalSqlMeta()
-                    .get_value(key="sql_plan_monitor_dfo_op_oracle_obversion4")
-                    .replace("##REPLACE_TRACE_ID##", trace_id)
-                    .replace("##REPLACE_PLAN_ID##", str(plan_id))
-                    .replace("##REPLACE_TENANT_ID##", str(tenant_id))
-                    .replace("##REPLACE_PLAN_EXPLAIN_TABLE_NAME##", self.plan_explain_name)
-                )
-            else:
-                sql = (
-                    GlobalSqlMeta()
-                    .get_value(key="sql_plan_monitor_dfo_op_oracle")
-                    .replace("##REPLACE_TRACE_ID##", trace_id)
-                    .replace("##REPLACE_PLAN_ID##", str(plan_id))
-                    .replace("##REPLACE_TENANT_ID##", str(tenant_id))
-                    .replace("##REPLACE_PLAN_EXPLAIN_TABLE_NAME##", self.plan_explain_name)
-                )
+    def __sql_template(self, name):
+        """
+        look up the GlobalSqlMeta template for the detected tenant mode and ob version,
+        e.g. sql_plan_monitor_dfo_op -> sql_plan_monitor_dfo_op_mysql_obversion4
+        """
+        key = "%s_%s%s" % (name, self.tenant_mode, "_obversion4" if self.ob_major_version >= 4 else "")
+        return _sql_meta.get_value(key=key)
 
-        return sql
+    def sql_plan_monitor_dfo_op_sql(self, tenant_id, plan_id, trace_id):
+        values = {"TRACE_ID": trace_id, "PLAN_ID": str(plan_id), "TENANT_ID": str(tenant_id), "PLAN_EXPLAIN_TABLE_NAME": self.plan_explain_name}
+        return _fill_template(self.__sql_template("sql_plan_monitor_dfo_op"), values)
 
     def sql_plan_monitor_svr_agg_template_sql(self):
-        if self.tenant_mode == 'mysql':
-            if self.ob_major_version >= 4:
-                sql = GlobalSqlMeta().get_value(key="sql_plan_monitor_svr_agg_template_mysql_obversion4")
-            else:
-                sql = GlobalSqlMeta().get_value(key="sql_plan_monitor_svr_agg_template_mysql")
-        else:
-            if self.ob_major_version >= 4:
-                sql = GlobalSqlMeta().get_value(key="sql_plan_monitor_svr_agg_template_oracle_obversion4")
-            else:
-                sql = GlobalSqlMeta().get_value(key="sql_plan_monitor_svr_agg_template_oracle")
-        return sql
+        return self.__sql_template("sql_plan_monitor_svr_agg_template")
 
     def sql_plan_monitor_detail_template_sql(self):
-        if self.tenant_mode == 'mysql':
-            if self.ob_major_version >= 4:
-                sql = GlobalSqlMeta().get_value(key="sql_plan_monitor_detail_template_mysql_obversion4")
-            else:
-                sql = GlobalSqlMeta().get_value(key="sql_plan_monitor_detail_template_mysql")
-        else:
-            if self.ob_major_version >= 4:
-                sql = GlobalSqlMeta().get_value(key="sql_plan_monitor_detail_template_oracle_obversion4")
-            else:
-                sql = GlobalSqlMeta().get_value(key="sql_plan_monitor_detail_template_oracle")
-        return sql
+        return self.__sql_template("sql_plan_monitor_detail_template")
 
     # sql audit 细节
     def report_sql_audit_details(self, sql):
@@ -796,7 +994,11 @@ class GatherPlanMonitorHandler(object):
 
             data_plan_explain = from_db_cursor(cursor_plan_explain)
             data_plan_explain.align = 'l'
-            self.report_pre(data_plan_explain)
+            if len(data_plan_explain.rows) > REPORT_INLINE_TABLE_MAX_ROWS:
+                # the ascii layout scans every row for column widths before formatting, html is a single pass
+                self.__report(data_plan_explain.get_html_string())
+            else:
+                self.report_pre(data_plan_explain)
             self.stdio.verbose("report plan_explain complete")
         except Exception as e:
             self.stdio.exception("plan cache> %s" % sql)
@@ -806,9 +1008,9 @@ class GatherPlanMonitorHandler(object):
     # sql_audit 概要
     def report_sql_audit(self):
         sql = self.sql_audit_by_trace_id_limit1_sql()
-        self.stdio.verbose("select sql_audit from ob with SQL: %s", sql)
+        self.stdio.verbose("select sql_audit from ob with SQL: %s, trace_id: %s", sql, self.trace_id)
         try:
-            sql_audit_result = self.sys_connector.execute_sql_pretty(sql)
+            sql_audit_result = self.sys_connector.execute_sql_pretty(sql, (self.trace_id,))
             self.stdio.verbose("sql_audit_result: %s", sql_audit_result)
             self.stdio.verbose("report sql_audit_result to file start ...")
             self.__report(sql_audit_result.get_html_string())
@@ -818,11 +1020,11 @@ class GatherPlanMonitorHandler(object):
             self.stdio.exception(repr(e))
 
     def report_plan_explain(self, db_name, raw_sql):
-        explain_sql = "explain extended %s" % raw_sql
+        explain_sql = f"explain extended {raw_sql}"
         try:
             sql_explain_cursor = self.db_connector.execute_sql_return_cursor(explain_sql)
             self.stdio.verbose("execute SQL: %s", explain_sql)
-            sql_explain_result_sql = "%s" % explain_sql
+            sql_explain_result_sql = explain_sql
             sql_explain_result = from_db_cursor(sql_explain_cursor)
 
             # output explain result
@@ -838,62 +1040,44 @@ class GatherPlanMonitorHandler(object):
             pass
 
     def report_sql_plan_monitor_dfo_op(self, sql):
-        data_sql_plan_monitor_dfo_op = self.sys_connector.execute_sql_pretty(sql)
+        columns, rows = self.__sys_sql_result(sql)
+        data_sql_plan_monitor_dfo_op = self.__pretty_table(columns, rows)
         self.__report("<div><h2 id='agg_table_anchor'>SQL_PLAN_MONITOR DFO 级调度时序汇总</h2><div class='v' id='agg_table' style='display: none'>" + data_sql_plan_monitor_dfo_op.get_html_string() + "</div></div>")
         self.stdio.verbose("report SQL_PLAN_MONITOR DFO complete")
-        cursor_sql_plan_monitor_dfo_op = self.sys_connector.execute_sql_return_cursor_dictionary(sql)
-        if self.ob_major_version >= 4:
-            self.report_dfo_sched_agg_graph_data_obversion4(cursor_sql_plan_monitor_dfo_op, '调度时序图')
-        else:
-            self.report_dfo_sched_agg_graph_data(cursor_sql_plan_monitor_dfo_op, '调度时序图')
+        cursor_sql_plan_monitor_dfo_op = self.__dict_rows(columns, rows)
+        self.__report_dfo_sched_graph(cursor_sql_plan_monitor_dfo_op, '调度时序图')
         self.stdio.verbose("report SQL_PLAN_MONITOR DFO SCHED complete")
-        cursor_sql_plan_monitor_dfo_op = self.sys_connector.execute_sql_return_cursor_dictionary(sql)
-        if self.ob_major_version >= 4:
-            self.report_dfo_agg_graph_data_obversion4(cursor_sql_plan_monitor_dfo_op, '数据时序图')
-        else:
-            self.report_dfo_agg_graph_data(cursor_sql_plan_monitor_dfo_op, '数据时序图')
+        self.__report_dfo_agg_graph(cursor_sql_plan_monitor_dfo_op, '数据时序图')
         self.stdio.verbose("report SQL_PLAN_MONITOR DFO graph data complete")
 
     def report_sql_plan_monitor_svr_agg(self, sql_plan_monitor_svr_agg_v1, sql_plan_monitor_svr_agg_v2):
-        cursor_sql_plan_monitor_svr_agg = self.sys_connector.execute_sql_return_cursor(sql_plan_monitor_svr_agg_v1)
+        columns, rows = self.__sys_sql_result(sql_plan_monitor_svr_agg_v1)
         self.__report(
             "<div><h2 id='svr_agg_table_anchor'>SQL_PLAN_MONITOR SQC 级汇总</h2><div class='v' id='svr_agg_table' style='display: none'>"
-            + from_db_cursor(cursor_sql_plan_monitor_svr_agg).get_html_string()
+            + self.__inline_table_html(columns, rows, "sql_plan_monitor_svr_agg.html", "SQL_PLAN_MONITOR SQC 级汇总")
             + "</div><div class='shortcut'><a href='#svr_agg_serial_v1'>Goto 算子优先</a> <a href='#svr_agg_serial_v2'>Goto 机器优先</a></div></div>"
         )
         self.stdio.verbose("report SQL_PLAN_MONITOR SQC complete")
-        cursor_sql_plan_monitor_svr_agg_v1 = self.sys_connector.execute_sql_return_cursor_dictionary(sql_plan_monitor_svr_agg_v2)
-        if self.ob_major_version >= 4:
-            self.report_svr_agg_graph_data_obversion4('svr_agg_serial_v1', cursor_sql_plan_monitor_svr_agg_v1, '算子优先视图')
-        else:
-            self.report_svr_agg_graph_data('svr_agg_serial_v1', cursor_sql_plan_monitor_svr_agg_v1, '算子优先视图')
+        cursor_sql_plan_monitor_svr_agg_v1 = self.__dict_rows(*self.__sys_sql_result(sql_plan_monitor_svr_agg_v2))
+        self.__report_svr_agg_graph('svr_agg_serial_v1', cursor_sql_plan_monitor_svr_agg_v1, '算子优先视图')
         self.stdio.verbose("report SQL_PLAN_MONITOR SQC operator priority complete")
-        cursor_data_sql_plan_monitor_svr_agg_v2 = self.sys_connector.execute_sql_return_cursor_dictionary(sql_plan_monitor_svr_agg_v2)
-        if self.ob_major_version >= 4:
-            self.report_svr_agg_graph_data('svr_agg_serial_v2', cursor_data_sql_plan_monitor_svr_agg_v2, '机器优先视图')
-        else:
-            self.report_svr_agg_graph_data('svr_agg_serial_v2', cursor_data_sql_plan_monitor_svr_agg_v2, '机器优先视图')
+        cursor_data_sql_plan_monitor_svr_agg_v2 = self.__dict_rows(*self.__sys_sql_result(sql_plan_monitor_svr_agg_v2))
+        self.report_svr_agg_graph_data('svr_agg_serial_v2', cursor_data_sql_plan_monitor_svr_agg_v2, '机器优先视图')
         self.stdio.verbose("report SQL_PLAN_MONITOR SQC server priority complete")
 
     def report_sql_plan_monitor_detail_operator_priority(self, sql):
-        cursor_sql_plan_monitor_detail = self.sys_connector.execute_sql_return_cursor(sql)
+        columns, rows = self.__sys_sql_result(sql)
         self.__report(
             "<div><h2 id='detail_table_anchor'>SQL_PLAN_MONITOR 详情</h2><div class='v' id='detail_table' style='display: none'>"
-            + ("no result in --fast mode" if self.enable_fast_dump else from_db_cursor(cursor_sql_plan_monitor_detail).get_html_string())
+            + ("no result in --fast mode" if self.enable_fast_dump else self.__inline_table_html(columns, rows, "sql_plan_monitor_detail.html", "SQL_PLAN_MONITOR 详情"))
             + "</div><div class='shortcut'><a href='#detail_serial_v1'>Goto 算子优先</a> <a href='#detail_serial_v2'>Goto 线程优先</a></div></div>"
         )
         self.stdio.verbose("report SQL_PLAN_MONITOR details complete")
-        cursor_sql_plan_monitor_detail_v1 = self.sys_connector.execute_sql_return_cursor_dictionary(sql)
-        if self.ob_major_version >= 4:
-            self.report_detail_graph_data_obversion4("detail_serial_v1", cursor_sql_plan_monitor_detail_v1, '算子优先视图')
-        else:
-            self.report_detail_graph_data("detail_serial_v1", cursor_sql_plan_monitor_detail_v1, '算子优先视图')
+        cursor_sql_plan_monitor_detail_v1 = self.__dict_rows(columns, rows)
+        self.__report_detail_graph("detail_serial_v1", cursor_sql_plan_monitor_detail_v1, '算子优先视图')
         self.stdio.verbose("report SQL_PLAN_MONITOR details operator priority complete")
 
     def reportsql_plan_monitor_detail_svr_priority(self, sql):
-        cursor_sql_plan_monitor_detail_v2 = self.sys_connector.execute_sql_return_cursor_dictionary(sql)
-        if self.ob_major_version >= 4:
-            self.report_detail_graph_data_obversion4("detail_serial_v2", cursor_sql_plan_monitor_detail_v2, '线程优先视图')
-        else:
-            self.report_detail_graph_data("detail_serial_v2", cursor_sql_plan_monitor_detail_v2, '线程优先视图')
+        cursor_sql_plan_monitor_detail_v2 = self.__dict_rows(*self.__sys_sql_result(sql))
+        self.__report_detail_graph("detail_serial_v2", cursor_sql_plan_monitor_detail_v2, '线程优先视图')
         self.stdio.verbose("report SQL_PLAN_MONITOR details server priority complete")
@@ -21,6 +21,9 @@ from common.ob_connector import OBConnector
 from tabulate import tabulate
 from common.tool import StringUtils
 
+# sys tenant connectors shared by the sql steps of one obdiag run, keyed by (db_host, db_port, user)
+_ob_connector_cache = {}
+
 
 class StepSQLHandler(SafeStdio):
     def __init__(self, context, step, ob_cluster, report_path, task_variable_dict):
@@ -32,7 +35,12 @@ class StepSQLHandler(SafeStdio):
             self.tenant_mode = None
             self.sys_database = None
             self.database = None
-            self.ob_connector = OBConnector(ip=ob_cluster.get("db_host"), port=ob_cluster.get("db_port"), username=ob_cluster.get("tenant_sys").get("user"), password=ob_cluster.get("tenant_sys").get("password"), stdio=self.stdio, timeout=10000)
+            cache_key = (ob_cluster.get("db_host"), ob_cluster.get("db_port"), ob_cluster.get("tenant_sys").get("user"))
+            self.ob_connector = _ob_connector_cache.get(cache_key)
+            # do not hand a connection lost by an earlier step to the next one
+            if self.ob_connector is None or self.ob_connector.conn is None or not self.ob_connector.conn.open:
+                self.ob_connector = OBConnector(ip=ob_cluster.get("db_host"), port=ob_cluster.get("db_port"), username=ob_cluster.get("tenant_sys").get("user"), password=ob_cluster.get("tenant_sys").get("password"), stdio=self.stdio, timeout=10000)
+                _ob_connector_cache[cache_key] = self.ob_connector
         except Exception as e:
             self.stdio.error("StepSQLHandler init fail. Please check the OBCLUSTER conf. OBCLUSTER: {0} Exception : {1} .".format(ob_cluster, e))
         self.task_variable_dict = task_variable_dict
@@ -62,8 +70,7 @@ class StepSQLHandler(SafeStdio):
 
     def report(self, sql, column_names, data):
         try:
-            table_data = [list(row) for row in data]
-            formatted_table = tabulate(table_data, headers=column_names, tablefmt="grid")
+            formatted_table = tabulate(data, headers=column_names, tablefmt="grid", disable_numparse=True)
 
             # Check file size and rename if necessary
             while True:
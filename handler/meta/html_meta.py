@@ -203,6 +203,40 @@ html_dict.set_value(
     ''',
 )
 
+html_dict.set_value(
+    "sql_plan_monitor_report_fast_preview",
+    '''
+        <script>
+        generate_graph("dfo", agg_serial, $('#agg_serial'));
+        generate_graph("dfo", agg_sched_serial, $('#agg_sched_serial'));
+        generate_graph("sqc", svr_agg_serial_v1, $('#svr_agg_serial_v1'));
+        generate_graph("sqc", svr_agg_serial_v2, $('#svr_agg_serial_v2'));
+        </script>
+        ''',
+)
+
+html_dict.set_value(
+    "sql_plan_monitor_report_section_page",
+    '''
+    <!doctype html>
+    <html lang="en">
+      <head>
+        <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1, shrink-to-fit=no">
+    <link rel="stylesheet" href="./resources/web/bootstrap.min.css" >
+    <style>
+    body{ padding:10px; padding-bottom:50px;}
+    table {font-family: Consolas,"Courier New",Courier,FreeMono,monospace !important;}
+    </style>
+    </head>
+    <body>
+    <h2>##REPLACE_TITLE##</h2>
+    ##REPLACE_CONTENT##
+    </body>
+    </html>
+    ''',
+)
+
 html_dict.set_value(
     "sql_plan_monitor_report_footer",
     '''
@@ -33,6 +33,7 @@ class RcaScenesListHandler:
         else:
             self.stdio.warn("input rca work_path not exists: {0}, use default path {1}".format(work_path, const.RCA_WORK_PATH))
             self.work_path = const.RCA_WORK_PATH
+        self.rca_files = None
 
     def get_all_scenes(self):
         # find all rca file
@@ -43,10 +44,11 @@ class RcaScenesListHandler:
         if not scenes_files or len(scenes_files) == 0:
             self.stdio.error("no rca scene found! Please check RCA_WORK_PATH: {0}".format(self.work_path))
             return
+        # every scene lives in work_path, one sys.path entry covers them all.
+        # DynamicLoading.import_module keeps imported modules in DynamicLoading.MODULES, repeated calls do not import again
+        DynamicLoading.add_lib_path(self.work_path)
         for scene_file in scenes_files:
-            lib_path = self.work_path
             module_name = os.path.basename(scene_file)[:-9]
-            DynamicLoading.add_lib_path(lib_path)
             module = DynamicLoading.import_module(os.path.basename(scene_file)[:-3], None)
             if not hasattr(module, module_name):
                 self.stdio.error("{0} import_module failed".format(module_name))
@@ -68,10 +70,13 @@ class RcaScenesListHandler:
             raise e
 
     def __find_rca_files(self):
+        if self.rca_files is not None:
+            return self.rca_files
         files = []
-        for file_or_folder in os.listdir(self.work_path):
-            full_path = os.path.join(self.work_path, file_or_folder)
-            if os.path.isfile(full_path):
-                if full_path.endswith('_scene.py') and len(os.path.basename(full_path)) > 7:
-                    files.append(full_path)
+        # DirEntry.is_file() uses the type from the directory listing, no stat per entry
+        with os.scandir(self.work_path) as entries:
+            for entry in entries:
+                if entry.name.endswith('_scene.py') and len(entry.name) > 7 and entry.is_file():
+                    files.append(os.path.join(self.work_path, entry.name))
+        self.rca_files = files
         return files
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*
+# Copyright (c) 2022 OceanBase
+# OceanBase Diagnostic Tool is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+"""
+@file: test_ob_connector.py
+@desc:
+"""
+
+import unittest
+from unittest import mock
+
+from common import ob_connector
+from common.ob_connector import OBConnector, CONN_PING_IDLE_SECONDS
+
+
+class CheckConnTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.conn = mock.MagicMock()
+        self.conn.open = True
+        patchers = [
+            mock.patch.object(ob_connector.mysql, "connect", return_value=self.conn),
+            mock.patch.object(ob_connector.time, "monotonic", side_effect=lambda: self.now),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.connector = OBConnector(ip="127.0.0.1", port=2881, username="root@sys", stdio=mock.MagicMock())
+        self.conn.ping.reset_mock()
+
+    def test_recently_used_connection_is_not_pinged(self):
+        self.now += CONN_PING_IDLE_SECONDS - 1
+        self.connector.execute_sql("select 1")
+        self.conn.ping.assert_not_called()
+
+    def test_idle_connection_is_pinged(self):
+        self.now += CONN_PING_IDLE_SECONDS + 1
+        self.connector.execute_sql("select 1")
+        self.conn.ping.assert_called_once_with(reconnect=True)
+
+    def test_each_query_restarts_the_idle_window(self):
+        for _ in range(3):
+            self.now += CONN_PING_IDLE_SECONDS - 1
+            self.connector.execute_sql("select 1")
+        self.conn.ping.assert_not_called()
+
+    def test_closed_connection_is_reopened_before_the_idle_window_ends(self):
+        self.conn.open = False
+        self.now += 1
+        self.connector.execute_sql("select 1")
+        self.conn.ping.assert_called_once_with(reconnect=True)
+
+    def test_missing_connection_is_connected(self):
+        self.connector.conn = None
+        self.connector.execute_sql("select 1")
+        self.assertIs(self.connector.conn, self.conn)
+        self.conn.ping.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*
+# Copyright (c) 2022 OceanBase
+# OceanBase Diagnostic Tool is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""
+@file: test_tool.py
+@desc:
+"""
+
+import unittest
+
+from common.tool import StringUtils
+
+
+class CompareVersionsTest(unittest.TestCase):
+    def test_differing_component(self):
+        self.assertTrue(StringUtils.compare_versions_greater("4.2.1.0", "4.2.0.9"))
+        self.assertFalse(StringUtils.compare_versions_lower("4.2.1.0", "4.2.0.9"))
+        self.assertTrue(StringUtils.compare_versions_greater("4.10.0.0", "4.9.0.0"))
+        self.assertTrue(StringUtils.compare_versions_lower("3.2.4.0", "4.0.0.0"))
+
+    def test_equal(self):
+        self.assertFalse(StringUtils.compare_versions_greater("4.2.1.0", "4.2.1.0"))
+        self.assertFalse(StringUtils.compare_versions_lower("4.2.1.0", "4.2.1.0"))
+
+    def test_equal_prefix_differing_length(self):
+        # the longer version is the greater one when the shorter is its prefix
+        self.assertTrue(StringUtils.compare_versions_greater("4.2.0", "4.2"))
+        self.assertTrue(StringUtils.compare_versions_lower("4.2", "4.2.0"))
+        self.assertTrue(StringUtils.compare_versions_greater("4.2.1.0.1", "4.2.1.0"))
+        self.assertFalse(StringUtils.compare_versions_greater("4.2", "4.2.0"))
+
+    def test_suffixed(self):
+        self.assertTrue(StringUtils.compare_versions_greater("4.3.0.1-beta", "4.0.0.0"))
+        self.assertFalse(StringUtils.compare_versions_lower("4.3.0.1-beta", "4.0.0.0"))
+        self.assertTrue(StringUtils.compare_versions_greater("4.2.1.1", "4.2.1.0-bp1"))
+        self.assertTrue(StringUtils.compare_versions_lower("4.2.1.0_CE", "4.2.1.1"))
+        self.assertFalse(StringUtils.compare_versions_greater("4.2.1.0-bp1", "4.2.1.0"))
+
+
+if __name__ == '__main__':
+    unittest.main()
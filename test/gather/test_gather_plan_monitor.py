@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*
+# Copyright (c) 2022 OceanBase
+# OceanBase Diagnostic Tool is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+"""
+@file: test_gather_plan_monitor.py
+@desc:
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from handler.gather import gather_plan_monitor
+from handler.gather.gather_plan_monitor import GatherPlanMonitorHandler, REPORT_INLINE_TABLE_MAX_ROWS, _fill_template
+
+
+def new_handler():
+    context = mock.MagicMock()
+    context.get_variable.return_value = None
+    return GatherPlanMonitorHandler(context)
+
+
+class FillTemplateTest(unittest.TestCase):
+    def test_replaces_every_placeholder(self):
+        template = "select * from t where trace_id = '##REPLACE_TRACE_ID##' or id = '##REPLACE_TRACE_ID##' order by ##REPLACE_ORDER_BY##"
+        self.assertEqual(_fill_template(template, {"TRACE_ID": "Y1", "ORDER_BY": "ID"}), "select * from t where trace_id = 'Y1' or id = 'Y1' order by ID")
+
+    def test_unknown_placeholder_is_kept(self):
+        self.assertEqual(_fill_template("##REPLACE_A## ##REPLACE_B##", {"A": "a"}), "a ##REPLACE_B##")
+
+    def test_values_are_inserted_literally(self):
+        # a value is not searched for placeholders again and backslashes are not regex escapes
+        self.assertEqual(_fill_template("##REPLACE_A##,##REPLACE_B##", {"A": "##REPLACE_B##", "B": "\\1"}), "##REPLACE_B##,\\1")
+
+
+class InlineTableTest(unittest.TestCase):
+    def setUp(self):
+        self.pack_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.pack_dir)
+        self.handler = new_handler()
+        self.handler.report_file_path = os.path.join(self.pack_dir, "sql_plan_monitor_report.html")
+        self.columns = ["PLAN_LINE_ID", "SVR_IP"]
+
+    def inline_table_html(self, rows):
+        return self.handler._GatherPlanMonitorHandler__inline_table_html(self.columns, rows, "section.html", "section")
+
+    def rows(self, count):
+        return [(i, "row-%d" % i) for i in range(count)]
+
+    def test_short_table_stays_inline(self):
+        html = self.inline_table_html(self.rows(REPORT_INLINE_TABLE_MAX_ROWS))
+        self.assertEqual(html.count("<tr>"), REPORT_INLINE_TABLE_MAX_ROWS + 1)
+        self.assertNotIn("section.html", html)
+        self.assertFalse(os.path.exists(os.path.join(self.pack_dir, "section.html")))
+
+    def test_long_table_keeps_head_and_tail_inline(self):
+        count = REPORT_INLINE_TABLE_MAX_ROWS + 100
+        half = REPORT_INLINE_TABLE_MAX_ROWS // 2
+        html = self.inline_table_html(self.rows(count))
+        # header, head rows, the gap row and tail rows
+        self.assertEqual(html.count("<tr>"), 1 + half + 1 + half)
+        self.assertIn("row-%d<" % (half - 1), html)
+        self.assertNotIn("row-%d<" % half, html)
+        self.assertIn("(%d rows hidden)" % (count - 2 * half), html)
+        self.assertNotIn("row-%d<" % (count - half - 1), html)
+        self.assertIn("row-%d<" % (count - half), html)
+        self.assertIn("row-%d<" % (count - 1), html)
+        self.assertIn("<a href='./section.html' target='_blank'>section.html (%d rows)</a>" % count, html)
+
+    def test_long_table_page_is_written_next_to_the_report(self):
+        count = REPORT_INLINE_TABLE_MAX_ROWS + 1
+        self.inline_table_html(self.rows(count))
+        page_path = os.path.join(self.pack_dir, "section.html")
+        self.assertTrue(os.path.isfile(page_path))
+        with open(page_path, encoding="utf-8") as f:
+            page = f.read()
+        self.assertEqual(page.count("<tr>"), count + 1)
+        self.assertNotIn("rows hidden", page)
+        # the resources are copied next to the report, the page resolves them the same way
+        self.assertIn('href="./resources/web/bootstrap.min.css"', page)
+        self.assertIn("<h2>section</h2>", page)
+
+
+class TenantModeCacheTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(gather_plan_monitor._tenant_mode_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def new_handler(self, port=2881):
+        handler = new_handler()
+        handler.db_connector = mock.MagicMock(ip="127.0.0.1", port=port, username="root@test")
+        handler.db_connector.execute_sql.return_value = [("version_comment", "OceanBase_CE 4.2.1.0 (r100000)")]
+        handler.sys_connector = mock.MagicMock()
+        return handler
+
+    def test_detection_is_cached_per_connection(self):
+        first = self.new_handler()
+        self.assertTrue(first.tenant_mode_detected())
+        self.assertEqual((first.tenant_mode, first.ob_major_version, first.sql_audit_name), ("mysql", 4, "gv$ob_sql_audit"))
+
+        second = self.new_handler()
+        self.assertTrue(second.tenant_mode_detected())
+        second.db_connector.execute_sql.assert_not_called()
+        self.assertEqual((second.tenant_mode, second.ob_major_version, second.sql_audit_name, second.plan_explain_name, second.sys_database), (first.tenant_mode, first.ob_major_version, first.sql_audit_name, first.plan_explain_name, first.sys_database))
+
+    def test_other_connection_is_detected_again(self):
+        self.assertTrue(self.new_handler().tenant_mode_detected())
+        other = self.new_handler(port=2882)
+        self.assertTrue(other.tenant_mode_detected())
+        other.db_connector.execute_sql.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,7 @@
 import os
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from common.constant import const
 from common.tool import FileUtil
 from common.tool import NetUtils
@@ -26,6 +27,9 @@ from common.tool import Util
 from common.version import OBDIAG_VERSION
 import yaml
 
+# libyaml based loader when pyyaml was built with it, same safe subset as yaml.safe_load
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 # for update obdiag files without obdiag
 class UpdateHandler:
@@ -39,30 +43,42 @@ class UpdateHandler:
         self.options = self.context.options
         self.file_path = ""
         self.force = False
+        self.obdiag_home = os.path.expanduser("~/.obdiag")
         # on obdiag update command
         if context.namespace.spacename == "update":
             self.file_path = Util.get_option(self.options, 'file', default="")
             self.force = Util.get_option(self.options, 'force', default=False)
 
     def execute(self):
+        session = None
         try:
             file_path = self.file_path
             force = self.force
             remote_server = const.UPDATE_REMOTE_SERVER
             remote_version_file_name = const.UPDATE_REMOTE_VERSION_FILE_NAME
-            local_version_file_name = os.path.expanduser('~/.obdiag/remote_version.yaml')
+            local_version_file_name = os.path.join(self.obdiag_home, 'remote_version.yaml')
             remote_update_file_name = const.UPDATE_REMOTE_UPDATE_FILE_NAME
-            local_update_file_name = os.path.expanduser('~/.obdiag/data.tar')
-            local_update_log_file_name = os.path.expanduser('~/.obdiag/data_version.yaml')
+            local_update_file_name = os.path.join(self.obdiag_home, 'data.tar')
+            local_update_log_file_name = os.path.join(self.obdiag_home, 'data_version.yaml')
             if file_path and file_path != "":
                 self.handle_update_offline(file_path)
                 return
-            if NetUtils.network_connectivity(remote_server) is False:
+            local_data = None
+            if force is False and os.path.exists(local_update_log_file_name):
+                with open(local_update_log_file_name, 'r') as file:
+                    local_data = yaml.load(file, Loader=_YAML_LOADER)
+                # updated within the last 7 days, no need to ask the remote server
+                if local_data.get("data_update_time") is not None and time.time() - local_data["data_update_time"] < 3600 * 24 * 7:
+                    self.stdio.warn("[update] data_update_time No need to update.")
+                    return
+            # the probe and both downloads go to the same server, share one keep-alive connection
+            session = NetUtils.session()
+            if NetUtils.network_connectivity(remote_server, session=session) is False:
                 self.stdio.warn("[update] network connectivity failed. Please check your network connection.")
                 return
-            NetUtils.download_file(remote_version_file_name, os.path.expanduser(local_version_file_name))
+            NetUtils.download_file(remote_version_file_name, local_version_file_name, session=session)
             with open(local_version_file_name, 'r') as file:
-                remote_data = yaml.safe_load(file)
+                remote_data = yaml.load(file, Loader=_YAML_LOADER)
             if remote_data.get("obdiag_version") is None:
                 self.stdio.warn("obdiag_version is None. Do not perform the upgrade process.")
                 return
@@ -82,80 +98,55 @@ class UpdateHandler:
                 self.remote_tar_sha = remote_data["remote_tar_sha"]
             # need update?
             # get local sha
-            if force is False:
-                if os.path.exists(os.path.expanduser(local_update_log_file_name)):
-                    with open(os.path.expanduser(local_update_log_file_name), 'r') as file:
-                        local_data = yaml.safe_load(file)
-                    if local_data.get("remote_tar_sha") is not None and local_data.get("remote_tar_sha") == self.remote_tar_sha:
-                        self.stdio.warn("[update] remote_tar_sha as local_tar_sha. No need to update.")
-                        return
-                    # get data_update_time
-                    if local_data.get("data_update_time") is not None and time.time() - local_data["data_update_time"] < 3600 * 24 * 7:
-                        self.stdio.warn("[update] data_update_time No need to update.")
-                        return
-            # download_update_files
-            NetUtils.download_file(remote_update_file_name, local_update_file_name)
+            if local_data is not None:
+                if local_data.get("remote_tar_sha") is not None and local_data.get("remote_tar_sha") == self.remote_tar_sha:
+                    self.stdio.warn("[update] remote_tar_sha as local_tar_sha. No need to update.")
+                    return
+            # download_update_files, the sha is computed while downloading
+            self.local_update_file_sha = NetUtils.download_file_with_sha256(remote_update_file_name, local_update_file_name, session=session)
             # check_sha
-            self.local_update_file_sha = FileUtil.calculate_sha256(local_update_file_name)
             if self.remote_tar_sha != self.local_update_file_sha:
                 self.stdio.warn("remote_tar_sha is {0}, but local_tar_sha is {1}. Unable to update dependency files. Do not perform the upgrade process.".format(self.remote_tar_sha, self.local_update_file_sha))
                 return
-            # move old files
-            ## check_old_files
-            if os.path.exists(os.path.expanduser("~/.obdiag/check.d")):
-                shutil.rmtree(os.path.expanduser("~/.obdiag/check.d"))
-            if os.path.exists(os.path.expanduser("~/.obdiag/check")):
-                os.rename(os.path.expanduser("~/.obdiag/check"), os.path.expanduser("~/.obdiag/check.d"))
-            ## gather
-            if os.path.exists(os.path.expanduser("~/.obdiag/gather.d")):
-                shutil.rmtree(os.path.expanduser("~/.obdiag/gather.d"))
-            if os.path.exists(os.path.expanduser("~/.obdiag/gather")):
-                os.rename(os.path.expanduser("~/.obdiag/gather"), os.path.expanduser("~/.obdiag/gather.d"))
-
-            ## rca
-            if os.path.exists(os.path.expanduser("~/.obdiag/rca.d")):
-                shutil.rmtree(os.path.expanduser("~/.obdiag/rca.d"))
-            if os.path.exists(os.path.expanduser("~/.obdiag/rca")):
-                os.rename(os.path.expanduser("~/.obdiag/rca"), os.path.expanduser("~/.obdiag/rca.d"))
-            # decompression remote files
-            FileUtil.extract_tar(os.path.expanduser(local_update_file_name), os.path.expanduser("~/.obdiag"))
-            # update data save
-            with open(os.path.expanduser("~/.obdiag/data_version.yaml"), 'w') as f:
-                yaml.dump({"data_update_time": int(time.time()), "remote_tar_sha": self.remote_tar_sha}, f)
-            self.stdio.print("[update] Successfully updated. The original data is stored in the *. d folder.")
+            self.__update_files(local_update_file_name)
             return
         except Exception as e:
             self.stdio.warn('[update] Failed to update. Error message: {0}'.format(e))
+        finally:
+            if session is not None:
+                session.close()
 
     def handle_update_offline(self, file):
         file = os.path.expanduser(file)
 
-        self.local_update_file_sha = FileUtil.calculate_sha256(file)
         if os.path.exists(file) is False:
             self.stdio.error('{0} does not exist.'.format(file))
             return
         if not file.endswith('.tar'):
             self.stdio.error('{0} is not a tar file.'.format(file))
             return
-        ## check_old_files
-        if os.path.exists(os.path.expanduser("~/.obdiag/check.d")):
-            shutil.rmtree(os.path.expanduser("~/.obdiag/check.d"))
-        if os.path.exists(os.path.expanduser("~/.obdiag/check")):
-            os.rename(os.path.expanduser("~/.obdiag/check"), os.path.expanduser("~/.obdiag/check.d"))
-        ## gather
-        if os.path.exists(os.path.expanduser("~/.obdiag/gather.d")):
-            shutil.rmtree(os.path.expanduser("~/.obdiag/gather.d"))
-        if os.path.exists(os.path.expanduser("~/.obdiag/gather")):
-            os.rename(os.path.expanduser("~/.obdiag/gather"), os.path.expanduser("~/.obdiag/gather.d"))
+        self.local_update_file_sha = FileUtil.calculate_sha256(file)
+        self.__update_files(file)
 
-        ## rca
-        if os.path.exists(os.path.expanduser("~/.obdiag/rca.d")):
-            shutil.rmtree(os.path.expanduser("~/.obdiag/rca.d"))
-        if os.path.exists(os.path.expanduser("~/.obdiag/rca")):
-            os.rename(os.path.expanduser("~/.obdiag/rca"), os.path.expanduser("~/.obdiag/rca.d"))
+    def __update_files(self, tar_path):
+        # move old files to *.d, one directory listing instead of an exists check per path
+        present = set()
+        if os.path.isdir(self.obdiag_home):
+            with os.scandir(self.obdiag_home) as entries:
+                present = {entry.name for entry in entries}
+        names = ("check", "gather", "rca")
+        # the old backups are independent trees, remove them concurrently. result() re-raises a failed removal
+        old_backups = [os.path.join(self.obdiag_home, name + ".d") for name in names if name + ".d" in present]
+        if old_backups:
+            with ThreadPoolExecutor(max_workers=len(old_backups)) as executor:
+                for future in [executor.submit(shutil.rmtree, path) for path in old_backups]:
+                    future.result()
+        for name in names:
+            if name in present:
+                os.replace(os.path.join(self.obdiag_home, name), os.path.join(self.obdiag_home, name + ".d"))
         # decompression remote files
-        FileUtil.extract_tar(os.path.expanduser(file), os.path.expanduser("~/.obdiag"))
+        FileUtil.extract_tar(tar_path, self.obdiag_home)
         # update data save
-        with open(os.path.expanduser("~/.obdiag/data_version.yaml"), 'w') as f:
+        with open(os.path.join(self.obdiag_home, "data_version.yaml"), 'w') as f:
             yaml.dump({"data_update_time": int(time.time()), "remote_tar_sha": self.remote_tar_sha}, f)
         self.stdio.print("[update] Successfully updated. The original data is stored in the *. d folder.")